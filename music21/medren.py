@@ -64,8 +64,90 @@ allowableStrettoIntervals = {
              (4, False)],
     }
 
+_strettoTypes = (8, -8, 5, -5, 4, -4)
+
+# directed generic interval: ((stretto type allowing it, whether it may repeat), ...)
+_strettoTypesByInterval = {}
+for _strettoType, _rules in allowableStrettoIntervals.items():
+    for _generic, _repeatAllowed in _rules:
+        _strettoTypesByInterval[_generic] = _strettoTypesByInterval.get(_generic, ()) + ((_strettoType, _repeatAllowed),)
+del _strettoType, _rules, _generic, _repeatAllowed
+
 _validMensuralTypes = [None,'maxima', 'longa', 'brevis', 'semibrevis', 'minima', 'semiminima']
 _validMensuralAbbr = [None, 'Mx', 'L', 'B', 'SB', 'M', 'SM']
+# maps each type to the module's own string, so that notes of one type all share a single (interned) string
+_canonicalMensuralTypes = dict((t, t) for t in _validMensuralTypes)
+_mensuralTypeFromAbbr = dict(zip(_validMensuralAbbr, _validMensuralTypes))
+# in Italian notation, these types always fill (at least) a whole brevis
+_brevisOrLongerTypes = frozenset(['brevis', 'longa', 'maxima'])
+# types that carry an upstem by default, and types that may take a side stem
+_upstemTypes = frozenset(['minima', 'semiminima'])
+_sideStemTypes = frozenset(['semibrevis', 'minima'])
+
+# quarter length of one minima, by divisione symbol; everything else gets 0.25
+_minimaQuarterLengths = {'.q.': 0.5, '.p.': 0.5, '.i.': 0.5, '.n.': 0.5}
+
+# sign: (default line, fontString)
+_mensuralClefs = {
+    'C': (4, '0x4b'),
+    'F': (3, '0x5c'),
+    }
+
+# (mensuralType, stem, flag on that stem): fontString
+# lookups fall back to (mensuralType, stem, None), then to (mensuralType, None, None)
+_mensuralNoteFontStrings = {
+    ('maxima', None, None): '0x58',
+    ('Longa', None, None): '0x4c',
+    ('brevis', None, None): '0x42',
+    ('semibrevis', None, None): '0x53',
+    ('semibrevis', 'down', None): '0x4e',
+    ('semibrevis', 'side', None): '0x41',
+    ('minima', None, None): '0x4d',
+    ('minima', 'down', None): '0x44',
+    ('minima', 'down', 'left'): '0x46',
+    ('minima', 'down', 'right'): '0x47',
+    ('minima', 'side', None): '0x61',
+    ('semiminima', None, None): '0x59',
+    ('semiminima', 'down', None): '0x45',
+    ('semiminima', 'down', 'left'): '0x48',
+    }
+_mensuralNoteFontTypes = frozenset(key[0] for key in _mensuralNoteFontStrings)
+# black fontString: red fontString (red characters sit 0x20 above the black ones)
+_redMensuralNoteFontStrings = dict((fs, hex(int(fs, 16)+32))
+                                   for fs in list(_mensuralNoteFontStrings.values()) + ['0x49'])
+
+# accepted spellings of user-supplied arguments, mapped to their normalized values
+_unrecognized = object()
+_stemDirections = {None: None, 'none': None, 'None': None,
+                   'down': 'down', 'Down': 'down', 'side': 'side', 'Side': 'side'}
+_flagOrientations = {None: None, 'none': None, 'None': None,
+                     'left': 'left', 'Left': 'left', 'right': 'right', 'Right': 'right'}
+_booleanValues = {True: True, 'True': True, 'true': True,
+                  False: False, 'False': False, 'false': False}
+_mensuralColors = frozenset(['black', 'red'])
+_stemOrientations = frozenset(['left', 'right'])
+# ligature fill spellings, and the fill values a single notehead takes (as note.NotRest.noteheadFill)
+_filledValues = frozenset(['yes', 'fill', 'filled'])
+_emptyValues = frozenset(['no', 'empty'])
+_noteheadFillValues = frozenset([None, 'default', 'yes', 'no'])
+
+# mensural type of the first or last note of a ligature that is not a maxima and has no up stem:
+# (is first note, has down stem, is oblique or the line leaves it in the marked direction): type
+# the marked direction is downward from the first note and upward into the last
+_ligatureEndTypes = {
+    (True, False, False): 'brevis', (True, False, True): 'longa',
+    (True, True, False): 'longa', (True, True, True): 'brevis',
+    (False, False, False): 'longa', (False, False, True): 'brevis',
+    (False, True, False): 'brevis', (False, True, True): 'longa',
+    }
+
+# (tempus, prolation): (timeString, standardSymbol, fontString, minimaPerBrevis)
+_validMensurations = {
+    ('perfect', 'major'): ('9/8', 'O-dot', '0x50', 9),
+    ('perfect', 'minor'): ('6/8', 'C-dot', '0x63', 6),
+    ('imperfect', 'major'): ('3/4', 'O', '0x4f', 6),
+    ('imperfect', 'minor'): ('2/4', 'C', '0x43', 4),
+    }
 
 #===============================================================================
 # def _getTargetBeforeOrAtObj(music21Obj, targetClassList):
@@ -136,13 +218,10 @@ class MensuralClef(clef.Clef):
     def __init__(self, sign = 'C'):
         clef.Clef.__init__(self)
         self._line = None
-        
-        if sign == 'C':
-            self.sign = sign
-            self._line = 4
-        elif sign == 'F':
+
+        if sign in _mensuralClefs:
             self.sign = sign
-            self._line = 3
+            self._line, self._fontString = _mensuralClefs[sign]
         else:
             raise MedRenException('A %s-clef is not a recognized mensural clef'  % sign)
             
@@ -156,14 +235,16 @@ class MensuralClef(clef.Clef):
                     doc = '''The staff line the clef resides on''')
     
     def _getFontString(self):
-        if self.sign == 'C':
-            self._fontString = '0x4b'
-        else:
-            self._fontString = '0x5c'
         return self._fontString
-    
-    fontString = property(_getFontString, 
-                          doc = ''' Returns the utf-8 code corresponding to the mensural clef in Ciconia font''')
+
+    fontString = property(_getFontString,
+                          doc = ''' Returns the utf-8 code corresponding to the mensural clef in Ciconia font
+
+
+                          >>> cclef = medren.MensuralClef('C')
+                          >>> cclef.fontString
+                          '0x4b'
+                          ''')
 
 class Mensuration(meter.TimeSignature):
     '''
@@ -190,26 +271,9 @@ class Mensuration(meter.TimeSignature):
         self.timeString = None
         self._minimaPerBrevis = 0
         
-        if tempus == 'perfect' and prolation == 'major':
-            self.timeString = '9/8'
-            self.standardSymbol = 'O-dot'
-            self._fontString = '0x50'
-            self._minimaPerBrevis = 9
-        elif tempus == 'perfect' and prolation == 'minor':
-            self.timeString = '6/8'
-            self.standardSymbol = 'C-dot'
-            self._fontString = '0x63'
-            self._minimaPerBrevis = 6
-        elif tempus == 'imperfect' and prolation == 'major':
-            self.timeString = '3/4'
-            self.standardSymbol = 'O'
-            self._fontString = '0x4f'
-            self._minimaPerBrevis = 6
-        elif tempus == 'imperfect' and prolation == 'minor':
-            self.timeString = '2/4'
-            self.standardSymbol = 'C'
-            self._fontString = '0x43'
-            self._minimaPerBrevis = 4
+        if (tempus, prolation) in _validMensurations:
+            (self.timeString, self.standardSymbol,
+             self._fontString, self._minimaPerBrevis) = _validMensurations[(tempus, prolation)]
         else:
             raise MedRenException('cannot make out the mensuration from tempus %s and prolation %s' % (tempus, prolation)) 
 
@@ -270,14 +334,16 @@ class GeneralMensuralNote(base.Music21Object):
     
     Two general mensural notes are considered equal if they have the same mensural type, are present in the same context, and have the same offset within that context.
     '''
+    # shared defaults; instances only get their own copy once these are rebound
+    _gettingDuration = False
+    
     def __init__(self, mensuralTypeOrAbbr = 'brevis'):
         base.Music21Object.__init__(self)
-        self._gettingDuration = False
         self._duration = None
-        if mensuralTypeOrAbbr in _validMensuralTypes:
-            self._mensuralType = mensuralTypeOrAbbr
-        elif mensuralTypeOrAbbr in _validMensuralAbbr:
-            self.mensuralType = _validMensuralTypes[_validMensuralAbbr.index(mensuralTypeOrAbbr)]
+        if mensuralTypeOrAbbr in _canonicalMensuralTypes:
+            self._mensuralType = _canonicalMensuralTypes[mensuralTypeOrAbbr]
+        elif mensuralTypeOrAbbr in _mensuralTypeFromAbbr:
+            self.mensuralType = _mensuralTypeFromAbbr[mensuralTypeOrAbbr]
         else:
             raise MedRenException('%s is not a valid mensural type or abbreviation' % mensuralTypeOrAbbr)
         
@@ -308,27 +374,20 @@ class GeneralMensuralNote(base.Music21Object):
         True
         '''
         
-        eq = hasattr(other, 'mensuralType')
-        if eq:
-            eq = eq and (self.mensuralType == other.mensuralType)
-        if eq and hasattr(self, 'activeSite'):
-            eq = eq and hasattr(other, 'activeSite')
-            if eq:
-                eq = eq and (self.activeSite == other.activeSite)
-        if eq and hasattr(self, 'offset'):
-            eq = eq and hasattr(other, 'offset')
-            if eq:
-                eq = eq and (self.offset == other.offset)
-        return eq
+        if not isinstance(other, GeneralMensuralNote):
+            return False
+        return (self._mensuralType == other._mensuralType and
+                self.activeSite is other.activeSite and
+                self.offset == other.offset)
     
     def _getMensuralType(self):
         return self._mensuralType
     
     def _setMensuralType(self, mensuralTypeOrAbbr):
-        if mensuralTypeOrAbbr in _validMensuralTypes:
-            self._mensuralType = mensuralTypeOrAbbr
-        elif mensuralTypeOrAbbr in _validMensuralAbbr:
-            self.mensuralType = _validMensuralTypes[_validMensuralAbbr.index(mensuralTypeOrAbbr)]
+        if mensuralTypeOrAbbr in _canonicalMensuralTypes:
+            self._mensuralType = _canonicalMensuralTypes[mensuralTypeOrAbbr]
+        elif mensuralTypeOrAbbr in _mensuralTypeFromAbbr:
+            self.mensuralType = _mensuralTypeFromAbbr[mensuralTypeOrAbbr]
         else:
             raise MedRenException('%s is not a valid mensural type or abbreviation' % mensuralTypeOrAbbr)
     
@@ -389,7 +448,6 @@ class GeneralMensuralNote(base.Music21Object):
         
         Note: French notation not yet supported.    
         '''
-        mLen, mDur = 0, 0
         if self._gettingDuration is True:
             return duration.ZeroDuration()
         
@@ -402,16 +460,51 @@ class GeneralMensuralNote(base.Music21Object):
         index = self._getTranslator(mensurationOrDivisione = mOrD, surroundingStream = surroundingStream)
         
         if len(self.lenList) > 0:
-            if mOrD.standardSymbol in ['.q.', '.p.', '.i.', '.n.']:
-                mDur = 0.5
-            else:
-                mDur = 0.25
+            mDur = _minimaQuarterLengths.get(mOrD.standardSymbol, 0.25)
             mLen = self.lenList[index]
-        #print "MDUR! " + str(mDur) + "MLEN " + str(mLen) + "index " + str(index) + " MEASURE " + str(self._getSurroundingMeasure()[0])
             self.duration = duration.Duration(mLen*mDur)
         else:
             self.duration = duration.ZeroDuration()
     
+    def updateMeasureDurationsFromMensuration(self, mensuration = None, surroundingStream = None):
+        '''
+        Like :meth:`music21.medren.GeneralMensuralNote.updateDurationFromMensuration`, but updates the duration of every general mensural note 
+        in the measure containing this note at once, translating the measure a single time.
+        
+        
+        >>> s = stream.Stream()
+        >>> s.append(trecento.notation.Divisione('.p.'))
+        >>> for i in range(3):
+        ...    s.append(medren.MensuralNote('A', 'SB'))
+        >>> s.append(trecento.notation.Punctus())
+        >>> s.append(medren.MensuralNote('B', 'SB'))
+        >>> s.append(medren.MensuralNote('B', 'SB'))
+        >>> s.notes[0].updateMeasureDurationsFromMensuration(surroundingStream = s)
+        >>> [mn.duration.quarterLength for mn in s.notes]
+        [1.0, 1.0, 1.0, 0.0, 0.0]
+        >>> s.notes[3].updateMeasureDurationsFromMensuration(surroundingStream = s)
+        >>> [mn.duration.quarterLength for mn in s.notes]
+        [1.0, 1.0, 1.0, 1.0, 2.0]
+        '''
+        if mensuration is None:
+            mOrD = self._determineMensurationOrDivisione()
+        else:
+            mOrD = mensuration
+        
+        measure, index = self._getSurroundingMeasure(mensurationOrDivisione = mOrD, activeSite = surroundingStream)
+        if index == -1 or len(measure) == 0 or not isinstance(mOrD, trecento.notation.Divisione):
+            self.updateDurationFromMensuration(mensuration = mOrD, surroundingStream = surroundingStream)
+            return
+        
+        lenList = trecento.notation.TranslateBrevisLength(mOrD, measure).getKnownLengths()
+        mDur = _minimaQuarterLengths.get(mOrD.standardSymbol, 0.25)
+        for i, mn in enumerate(measure):
+            mn.lenList = lenList
+            if i < len(lenList):
+                mn.duration = duration.Duration(lenList[i]*mDur)
+            else:
+                mn.duration = duration.ZeroDuration()
+    
     
     def _getTranslator(self, mensurationOrDivisione = None, surroundingStream = None):
 
@@ -421,7 +514,7 @@ class GeneralMensuralNote(base.Music21Object):
         measure, index = self._getSurroundingMeasure(mensurationOrDivisione = mOrD, activeSite = surroundingStream)
         
         self._gettingDuration = True
-        if len(measure) > 0 and 'Divisione' in mOrD.classes:
+        if len(measure) > 0 and isinstance(mOrD, trecento.notation.Divisione):
             if index == 0:
                 self.lenList = trecento.notation.TranslateBrevisLength(mOrD, measure).getKnownLengths()
             elif index != -1:
@@ -451,15 +544,26 @@ class GeneralMensuralNote(base.Music21Object):
         >>> s_1.insert(3, s_2)
         >>> gmn._determineMensurationOrDivisione()
         <music21.trecento.notation.Divisione .q.>
+        
+        The sign is looked up again on every call, so one added later is found.
+        
+        >>> gmn_1 = medren.GeneralMensuralNote('brevis')
+        >>> s_4 = stream.Stream()
+        >>> s_4.append(gmn_1)
+        >>> gmn_1._determineMensurationOrDivisione()
+        >>> d_p = trecento.notation.Divisione('.p.')
+        >>> s_4.insert(0, d_p)
+        >>> gmn_1._determineMensurationOrDivisione()
+        <music21.trecento.notation.Divisione .p.>
+        >>> s_4.remove(d_p)
+        >>> s_4.insert(0, trecento.notation.Divisione('.i.'))
+        >>> gmn_1._determineMensurationOrDivisione()
+        <music21.trecento.notation.Divisione .i.>
         '''
         
         #mOrD = music21.medren._getTargetBeforeOrAtObj(self, [Mensuration, trecento.notation.Divisione])
         searchClasses = (Mensuration, trecento.notation.Divisione)
-        mOrD = self.getContextByClass(searchClasses)
-        if mOrD is not None:
-            return mOrD
-        else:
-            return None
+        return self.getContextByClass(searchClasses)
 #        if len(mOrD)> 0:
 #            mOrD = mOrD[0] #Gets most recent M or D
 #        else:
@@ -497,6 +601,32 @@ class GeneralMensuralNote(base.Music21Object):
         >>> s_2.append(medren.Ligature(['A','B']))
         >>> gmn_2._getSurroundingMeasure(activeSite = s_2)
         ([<music21.medren.MensuralNote semibrevis A>, <music21.medren.MensuralNote semibrevis B>, <music21.medren.GeneralMensuralNote semibrevis>], 2)
+        
+        The index is the position of the general mensural note within the returned list, so objects that are not notes or rests do not count.
+        
+        >>> s_3 = stream.Stream()
+        >>> s_3.append(trecento.notation.Divisione('.p.'))
+        >>> s_3.append(trecento.notation.Punctus())
+        >>> s_3.append(medren.MensuralNote('A', 'semibrevis'))
+        >>> s_3.append(medren.MensuralClef('C'))
+        >>> gmn_3 = medren.GeneralMensuralNote('semibrevis')
+        >>> s_3.append(gmn_3)
+        >>> gmn_3._getSurroundingMeasure(activeSite = s_3)
+        ([<music21.medren.MensuralNote semibrevis A>, <music21.medren.GeneralMensuralNote semibrevis>], 1)
+        
+        The measure is found afresh on each call, so changes to other notes are seen.
+        
+        >>> s_4 = stream.Stream()
+        >>> s_4.append(trecento.notation.Divisione('.p.'))
+        >>> a, b, c = [medren.MensuralNote(p, 'SB') for p in 'ABC']
+        >>> s_4.append([a, b, c])
+        >>> len(a._getSurroundingMeasure(activeSite = s_4)[0])
+        3
+        >>> b.mensuralType = 'brevis'
+        >>> a._getSurroundingMeasure(activeSite = s_4)
+        ([<music21.medren.MensuralNote semibrevis A>], 0)
+        >>> c._getSurroundingMeasure(activeSite = s_4)
+        ([<music21.medren.MensuralNote semibrevis C>], 0)
         '''
         
         mOrD = mensurationOrDivisione
@@ -504,8 +634,7 @@ class GeneralMensuralNote(base.Music21Object):
             mOrD = self._determineMensurationOrDivisione()
 
         mList = []
-        currentIndex, index = -1, -1
-        indOffset = 0 
+        index = -1
         
         if activeSite is None:
             site = self.activeSite
@@ -513,47 +642,45 @@ class GeneralMensuralNote(base.Music21Object):
             site = activeSite
         
         if (site is not None):
-            if self.mensuralType in ['brevis', 'longa', 'maxima']:
+            if self.mensuralType in _brevisOrLongerTypes:
                 mList = [self]
-                currentIndex = 0
+                index = 0
             else:
-                tempList = site.recurse()[1:]
+                measureBreakClasses = (trecento.notation.Punctus, Ligature)
+                isDivisione = isinstance(mOrD, trecento.notation.Divisione)
                 if site.isMeasure:
-                    mList += tempList
-                else:                    
-                    for ind, item in enumerate(tempList):
-                        if self is item:
-                            currentIndex = ind
-                                       
-                    for i in range(currentIndex-1, -1, -1):
+                    mList += site.recurse()[1:]
+                else:
+                    # a single forward pass over the site: notes since the last measure break are collected,
+                    # and the scan stops at the first break after this note
+                    foundSelf = False
+                    leadingNotes = None # notes before the first break; only needed if self is not found
+                    elements = site._yieldElementsDownward(streamsOnly=False, restoreActiveSites=True)
+                    elements.next() # the site itself
+                    for obj in elements:
+                        if obj is self and not foundSelf:
+                            foundSelf = True
+                            index = len(mList)
+                            mList.append(self)
+                            continue
                         # Punctus and ligature marks indicate a new measure
-                        if ('Punctus' in tempList[i].classes) or ('Ligature' in tempList[i].classes):
-                            indOffset = i+1
-                            break
-                        elif 'GeneralMensuralNote' in tempList[i].classes:
-                            # In Italian notation, brevis, longa, and maxima indicate a new measure
-                            if ('Divisione' in mOrD.classes) and \
-                            (tempList[i].mensuralType in ['brevis', 'longa', 'maxima']):
-                                indOffset = i+1
+                        # In Italian notation, brevis, longa, and maxima indicate a new measure
+                        isBreak = isinstance(obj, measureBreakClasses) or \
+                            (isinstance(obj, GeneralMensuralNote) and isDivisione and
+                             obj.mensuralType in _brevisOrLongerTypes)
+                        if isBreak:
+                            if foundSelf:
                                 break
-                            else:
-                                mList.insert(i, tempList[i])
-                        else:
-                            indOffset += 1
+                            if leadingNotes is None:
+                                leadingNotes = mList
+                            mList = []
+                        elif isinstance(obj, GeneralMensuralNote):
+                            mList.append(obj)
                     
-                    mList.reverse()
-                    mList.insert(currentIndex, self)
-                    for j in range(currentIndex+1,len(tempList), 1):
-                        if ('Punctus' in tempList[j].classes) or ('Ligature' in tempList[j].classes):
-                            break
-                        if 'GeneralMensuralNote' in tempList[j].classes:
-                            if ('Divisione' in mOrD.classes) and \
-                            (tempList[j].mensuralType in ['brevis', 'longa', 'maxima']):
-                                break
-                            else:
-                                mList.insert(j, tempList[j])
-        
-        index = currentIndex - indOffset
+                    if not foundSelf:
+                        if leadingNotes is None:
+                            leadingNotes = mList
+                        mList = [self] + leadingNotes
         
         return mList, index
             
@@ -567,17 +694,16 @@ class MensuralRest(GeneralMensuralNote, note.Rest):
     
     # scaling?
     def __init__(self, *arguments, **keywords):
-        self._gettingDuration = False
         note.Rest.__init__(self, *arguments, **keywords)
         
         self._mensuralType = 'brevis'
         
         if len(arguments) > 0:
             tOrA = arguments[0]
-            if tOrA in _validMensuralTypes:
-                self._mensuralType = tOrA
-            elif tOrA in _validMensuralAbbr:
-                self._mensuralType = _validMensuralTypes[_validMensuralAbbr.index(tOrA)]
+            if tOrA in _canonicalMensuralTypes:
+                self._mensuralType = _canonicalMensuralTypes[tOrA]
+            elif tOrA in _mensuralTypeFromAbbr:
+                self._mensuralType = _mensuralTypeFromAbbr[tOrA]
             else:
                 raise MedRenException('%s is not a valid mensural type or abbreviation' % tOrA)
         
@@ -636,32 +762,26 @@ class MensuralNote(GeneralMensuralNote, note.Note):
     Additional methods regarding color, duration, mensural type are inherited from :class:`music21.medren.GeneralMensuralNote`.
     '''
     
+    # font string is computed lazily; reset whenever stems, flags, or color change
+    _fontString = None
+    
     # scaling? 
     def __init__(self, *arguments, **keywords):
-        self._gettingDuration = False        
         note.Note.__init__(self, *arguments, **keywords)
         self._mensuralType = 'brevis'    
         
         if len(arguments) > 1:
             tOrA = arguments[1]
-            if tOrA in _validMensuralTypes:
-                self._mensuralType = tOrA
-            elif tOrA in _validMensuralAbbr:
-                self._mensuralType = _validMensuralTypes[_validMensuralAbbr.index(tOrA)]
+            if tOrA in _canonicalMensuralTypes:
+                self._mensuralType = _canonicalMensuralTypes[tOrA]
+            elif tOrA in _mensuralTypeFromAbbr:
+                self._mensuralType = _mensuralTypeFromAbbr[tOrA]
             else:
                 raise MedRenException('%s is not a valid mensural type or abbreviation' % tOrA)
         
-        if self.mensuralType in ['minima', 'semiminima']:
-            self.stems = ['up']
-        else:
-            self.stems = []
-        
-        self.flags = dict((s, None) for s in self.stems)
-        if self._mensuralType == 'semiminima':
-            self.flags['up'] = 'right'
+        self._setDefaultStemsAndFlags()
             
         self._duration = None
-        self._fontString = ''
         
         self.lenList = []
     
@@ -686,14 +806,12 @@ class MensuralNote(GeneralMensuralNote, note.Note):
         False
         '''
         
-        eq = GeneralMensuralNote.__eq__(self, other)
-        eq  = eq and hasattr(other, 'pitch')
-        if eq:
-            eq = eq and (self.pitch == other.pitch)
-        eq = eq and hasattr(other, 'articulations')
-        if eq:
-            eq = eq and ( sorted(list(set(self.articulations))) == sorted(list(set(other.articulations))) )
-        return eq
+        if not isinstance(other, MensuralNote):
+            return False
+        # articulations are matched by class, as in note.Note.__eq__, so sets alone will not do
+        return (GeneralMensuralNote.__eq__(self, other) and
+                self.pitch == other.pitch and
+                sorted(list(set(self.articulations))) == sorted(list(set(other.articulations))))
     
     def _getFullName(self):
         msg = []
@@ -704,50 +822,38 @@ class MensuralNote(GeneralMensuralNote, note.Note):
     fullName = property(_getFullName)
     
     def _getFontString(self):
-        if self.mensuralType == 'maxima':
-            self._fontString = '0x58'
-        elif self.mensuralType == 'Longa':
-            self._fontString = '0x4c'
-        elif self.mensuralType == 'brevis':
-            self._fontString = '0x42'
-        elif self.mensuralType == 'semibrevis':
-            if 'down' in self.stems:
-                self._fontString = '0x4e'
-            elif 'side' in self.stems:
-                self._fontString = '0x41'
-            else:
-                self._fontString = '0x53'
-        elif self.mensuralType == 'minima':
+        if self._fontString is not None:
+            return self._fontString
+        
+        mType = self.mensuralType
+        if mType not in _mensuralNoteFontTypes:
+            mType = 'semiminima'
+        flags = self.flags
+        
+        if mType == 'semiminima' and flags['up'] == 'left':
+            fs = '0x49'
+        else:
             if 'down' in self.stems:
-                if 'down' in self.flags and self.flags['down'] == 'left':
-                    self._fontString = '0x46'
-                elif 'down' in self.flags and self.flags['down'] == 'right':
-                    self._fontString = '0x47'
-                else:
-                    self._fontString = '0x44'
+                stem = 'down'
+                flag = flags.get('down')
             elif 'side' in self.stems:
-                self._fontString = '0x61'
-            else:
-                self._fontString = '0x4d'
-        else:
-            if self.flags['up'] == 'left':
-                self._fontString = '0x49'
+                stem = 'side'
+                flag = None
             else:
-                if 'down' in self.stems: 
-                    if 'down' in self.flags and self.flags['down'] == 'left':
-                        self._fontString = '0x48'
-                    else:
-                        self._fontString = '0x45'
-                else:
-                    self._fontString = '0x59'
+                stem = None
+                flag = None
+            
+            fs = _mensuralNoteFontStrings.get((mType, stem, flag))
+            if fs is None:
+                fs = _mensuralNoteFontStrings.get((mType, stem, None))
+            if fs is None:
+                fs = _mensuralNoteFontStrings[(mType, None, None)]
         
         if self.color ==  'red':
-            if self._fontString in ['41', '61']:
-                self._fontString = ''
-            else:
-                self._fontString = hex(int(self._fontString, 16)+32)
+            fs = _redMensuralNoteFontStrings[fs]
         
-        return self._fontString
+        self._fontString = fs
+        return fs
     
     fontString = property(_getFontString, 
                           doc = ''' The utf-8 code corresponding to a mensural note in Ciconia font.
@@ -772,21 +878,15 @@ class MensuralNote(GeneralMensuralNote, note.Note):
     
     def _setMensuralType(self, mensuralTypeOrAbbr):
         GeneralMensuralNote._setMensuralType(self, mensuralTypeOrAbbr)
-        
-        if self.mensuralType in ['minima', 'semiminima']:
-            self.stems = ['up']
-        else:
-            self.stems = []
-        
-        self.flags = dict((s, None) for s in self.stems)
-        if self._mensuralType == 'semiminima':
-            self.flags['up'] = 'right'
+        self._fontString = None
+        self._setDefaultStemsAndFlags()
      
     mensuralType = property(GeneralMensuralNote._getMensuralType, _setMensuralType,
                           doc = ''' See documentation in `music21.medren.GeneralMensuralType`''')
     
     def _setColor(self, value):
-        if value in ['black', 'red']:
+        if value in _mensuralColors:
+            self._fontString = None
             note.Note._setColor(self, value)
         else:
             raise MedRenException('color %s not supported for mensural notes' % value)
@@ -851,25 +951,27 @@ class MensuralNote(GeneralMensuralNote, note.Note):
         ['up']
         '''
         
-        if direction in [None, 'none', 'None']:
-            if self.mensuralType in ['minima', 'semiminima']:
+        self._fontString = None
+        normalizedDirection = _stemDirections.get(direction, _unrecognized)
+        if normalizedDirection is None:
+            if self.mensuralType in _upstemTypes:
                 self.stems = ['up']
             else:
                 self.stems = []
         else:
-            if self.mensuralType in ['brevis','longa', 'maxima']:
+            if self.mensuralType in _brevisOrLongerTypes:
                 raise MedRenException('A note of type %s cannot be equipped with a stem' % self.mensuralType)
             else:
-                if direction in ['down', 'Down']:
+                if normalizedDirection == 'down':
                     direction = 'down'
                     if len(self.stems) > 1:
                         raise MedRenException('This note already has the maximum number of stems')
                     else:
                         self.stems.append(direction)
                             
-                elif direction in ['side', 'Side']:
+                elif normalizedDirection == 'side':
                     direction = 'side'
-                    if (self.mensuralType not in ['semibrevis', 'minima']) or self.getNumDots() > 0:
+                    if (self.mensuralType not in _sideStemTypes) or self.getNumDots() > 0:
                         raise MedRenException('This note may not have a stem of direction %s' % direction)
                     elif len(self.stems) > 1:
                         raise MedRenException('This note already has the maximum number of stems')
@@ -878,9 +980,25 @@ class MensuralNote(GeneralMensuralNote, note.Note):
                 else:
                     raise MedRenException('%s not recognized as a valid stem direction' % direction)
                 
+    def _setDefaultStemsAndFlags(self):
+        if self._mensuralType in _upstemTypes:
+            self.stems = ['up']
+            self.flags = {'up': None}
+            if self._mensuralType == 'semiminima':
+                self.flags['up'] = 'right'
+        else:
+            self.stems = []
+            self.flags = {}
+    
     def getFlags(self):
         '''
         Returns a dictionary of each stem with its corresponding flag. 
+        
+        
+        >>> medren.MensuralNote('A', 'brevis').getFlags()
+        {}
+        >>> medren.MensuralNote('A', 'brevis').flags
+        {}
         '''
         return self.flags
     
@@ -918,40 +1036,81 @@ class MensuralNote(GeneralMensuralNote, note.Note):
         MedRenException: a flag cannot be added to a stem with direction side
         '''
         
+        self._fontString = None
         if stemDirection == 'up':
             if self.mensuralType != 'semiminima':
                 raise MedRenException('a flag may not be added to an upstem of note type %s' % self.mensuralType)
             else:
-                if orientation in ['left', 'Left']:
-                    orientation = 'left'
-                    self.flags[stemDirection] = orientation
-                elif orientation in ['right', 'Right']:
-                    orientation = 'right'
-                    self.flags[stemDirection] = orientation
-                elif orientation in ['none', 'None', None]:
-                    orientation = 'right'
-                    self.flags[stemDirection] = orientation
-                else:
+                normalizedOrientation = _flagOrientations.get(orientation, _unrecognized)
+                if normalizedOrientation is _unrecognized:
                     raise MedRenException('a flag of orientation %s not supported' % orientation)
+                # a semiminima always keeps its upstem flag
+                self.flags[stemDirection] = normalizedOrientation or 'right'
         elif stemDirection == 'down':
             if stemDirection in self.stems:
-                if orientation in ['left', 'Left']:
-                    orientation = 'left'
-                    self.flags[stemDirection] = orientation
-                elif orientation in ['right', 'Right']:
-                    orientation = 'right'
-                    self.flags[stemDirection] = orientation
-                elif orientation in ['none', 'None', None]:
-                    orientation = None
-                    self.flags[stemDirection] = orientation
-                else:
+                normalizedOrientation = _flagOrientations.get(orientation, _unrecognized)
+                if normalizedOrientation is _unrecognized:
                     raise MedRenException('a flag of orientation %s not supported' % orientation)
+                self.flags[stemDirection] = normalizedOrientation
             else:
                 raise MedRenException('this note does not have a stem with direction %s' % stemDirection)
         else:
             raise MedRenException('a flag cannot be added to a stem with direction %s' % stemDirection)  
         
         
+class _ExpandedNotes(object):
+    '''
+    The `notes` attribute of a :class:`~music21.medren.Ligature`: returns the ligature as a list of mensural notes.
+    
+    The notes are expanded on the first read after the ligature changes and then stored on the ligature itself,
+    so that later reads are plain attribute lookups. Every method that edits the ligature clears them.
+    
+    
+    >>> l = medren.Ligature(['A4','B4'])
+    >>> print [n.mensuralType for n in l.notes]
+    ['brevis', 'brevis']
+    >>> second = l.notes[1]
+    >>> l.makeOblique(0)
+    >>> print [n.mensuralType for n in l.notes]
+    ['longa', 'brevis']
+    >>> l.notes[1] is second # unchanged notes are kept when the ligature is edited
+    True
+    >>> s = stream.Stream()
+    >>> s.append(second)
+    >>> l.makeOblique(0)
+    >>> l.notes[1] is second # but not once they have been placed in a stream
+    False
+    >>> l = medren.Ligature(['B4','A4'])
+    >>> print [n.mensuralType for n in l.notes]
+    ['longa', 'longa']
+    >>> l.makeOblique(0)
+    >>> print [n.mensuralType for n in l.notes]
+    ['longa', 'brevis']
+    >>> l.setStem(0, 'down','left')
+    >>> print [n.mensuralType for n in l.notes]
+    ['brevis', 'brevis']
+    >>> l = medren.Ligature(['G4','A4','B4','A4'])
+    >>> l.setStem(2, 'up','left')
+    >>> print [n.mensuralType for n in l.notes]
+    ['brevis', 'brevis', 'semibrevis', 'semibrevis']
+    >>> l = medren.Ligature(['B4','A4','G4','A4','G4','A4','F4'])
+    >>> l.makeOblique(0)
+    >>> l.makeOblique(4)
+    >>> l.setStem(2, 'down', 'left')
+    >>> l.setStem(4, 'up','left')
+    >>> l.setMaxima(6, True)
+    >>> print [n.mensuralType for n in l.notes]
+    ['longa', 'brevis', 'longa', 'brevis', 'semibrevis', 'semibrevis', 'maxima']
+    '''
+    def __get__(self, ligature, ligatureClass):
+        if ligature is None:
+            return self
+        ligature._notes = ligature._expandLigature()
+        # shadows this (non-data) descriptor until Ligature._clearNotes removes it again
+        ligature.__dict__['notes'] = ligature._notes
+        return ligature._notes
+    
+    
 class Ligature(base.Music21Object):
     '''
     An object that represents a ligature commonly found in medieval and Renaissance music. 
@@ -1005,6 +1164,9 @@ class Ligature(base.Music21Object):
     
     Note that ligatures cannot be displayed yet. 
     '''
+    # defaults for attributes that are only ever rebound, never changed in place
+    _length = 0
+    _notes = () # the most recent expansion, kept to reuse unchanged notes
 
     def __init__(self, pitches = None, color = 'black', filled = 'yes'):
         base.Music21Object.__init__(self)
@@ -1013,7 +1175,9 @@ class Ligature(base.Music21Object):
         if pitches is not None:
             self.pitches = pitches
         
-        self._notes = []
+        # index: value, for every note whose color or fill has been set; applied to the notes on expansion
+        self._colorOverrides = {}
+        self._fillOverrides = {}
         self.color = color
         self.filled = filled
         
@@ -1027,55 +1191,23 @@ class Ligature(base.Music21Object):
                     self._pitches.append(p)
                 else:
                     self._pitches.append(pitch.Pitch(p))
+        self._length = len(self._pitches)
+        self._clearNotes()
         
-        self.noteheadShape = dict([(ind, 'square') for ind in range(self._ligatureLength())])
-        self.stems = dict([(ind, (None,None)) for ind in range(self._ligatureLength())])
-        self.maximaNotes = dict([(ind, False) for ind in range(self._ligatureLength())])
-        self.reversedNotes = dict([(ind, False) for ind in range(self._ligatureLength())])
+        # one entry per note; notehead shapes are ('square',), ('oblique', 'start') or ('oblique', 'end')
+        self.noteheadShape = [('square',)] * self._length
+        self.stems = [(None, None)] * self._length
+        self.maximaNotes = [False] * self._length
+        self.reversedNotes = [False] * self._length
         
     pitches = property(_getPitches, _setPitches,
                        doc = '''A list of pitches comprising the ligature''')
     
-    def _getNotes(self):
-        if self._notes == []:
-            self._notes = self._expandLigature()
-        return self._notes
+    def _clearNotes(self):
+        # the next read of self.notes expands the ligature again
+        self.__dict__.pop('notes', None)
     
-    notes = property(_getNotes,
-                     doc = '''Returns the ligature as a list of mensural notes
-                     
-                     
-                     >>> l = medren.Ligature(['A4','B4'])
-                     >>> print [n.mensuralType for n in l.notes]
-                     ['brevis', 'brevis']
-                     >>> l.makeOblique(0)
-                     >>> print [n.mensuralType for n in l.notes]
-                     ['longa', 'brevis']
-                     >>> l = medren.Ligature(['B4','A4'])
-                     >>> print [n.mensuralType for n in l.notes]
-                     ['longa', 'longa']
-                     >>> l.makeOblique(0)
-                     >>> print [n.mensuralType for n in l.notes]
-                     ['longa', 'brevis']
-                     >>> l.setStem(0, 'down','left')
-                     >>> print [n.mensuralType for n in l.notes]
-                     ['brevis', 'brevis']
-                     >>> l = medren.Ligature(['G4','A4','B4','A4'])
-                     >>> l.setStem(2, 'up','left')
-                     >>> print [n.mensuralType for n in l.notes]
-                     ['brevis', 'brevis', 'semibrevis', 'semibrevis']
-                     >>> l = medren.Ligature(['B4','A4','G4','A4','G4','A4','F4'])
-                     >>> l.makeOblique(0)
-                     >>> l.makeOblique(4)
-                     >>> l.setStem(2, 'down', 'left')
-                     >>> l.setStem(4, 'up','left')
-                     >>> l.setMaxima(6, True)
-                     >>> print [n.mensuralType for n in l.notes]
-                     ['longa', 'brevis', 'longa', 'brevis', 'semibrevis', 'semibrevis', 'maxima']
-                     ''')
-        
-    def _ligatureLength(self):
-        return len(self.pitches)
+    notes = _ExpandedNotes()
     
     #def _getDuration(self):
         #return sum[n.duration for n in self.notes]
@@ -1094,7 +1226,7 @@ class Ligature(base.Music21Object):
         
         Returns True if the ligature is cum perfectione, and False if the ligature is sine perfectione.
         '''
-        return self.notes[self._ligatureLength()-1].mensuralType == 'longa'
+        return self.notes[self._length-1].mensuralType == 'longa'
     
     def isCOP(self):
         '''
@@ -1114,8 +1246,8 @@ class Ligature(base.Music21Object):
         if index == 'None' or index == 'none':
             index = None
         if index != None:
-            if index < self._ligatureLength():
-                return self.notes[index]._getColor()
+            if 0 <= index < self._length:
+                return self._colorOverrides.get(index)
             else:
                 raise MedRenException('no note exists at index %d' % index)
         else: 
@@ -1135,22 +1267,29 @@ class Ligature(base.Music21Object):
         >>> l.setColor('black',1)
         >>> l.getColor()
         'mixed'
+        >>> l.getColor(1)
+        'black'
+        >>> l.notes[1].color
+        'black'
         '''
         tempColor = self.getColor()
         if index == 'None' or index == 'none':
             index = None
         if index != None:
-            if index < self._ligatureLength():
+            if 0 <= index < self._length:
                 if value != tempColor:
+                    if value not in _mensuralColors:
+                        raise MedRenException('color %s not supported for mensural notes' % value)
                     self.color = 'mixed'
-                    self.notes[index]._setColor(value)
+                    self._colorOverrides[index] = value
+                    self._clearNotes()
             else:
                 raise MedRenException('no note exists at index %d' % index)
         else:
-            if value in ['black', 'red']:
+            if value in _mensuralColors:
                 self.color = value
-                for n in self.notes:
-                    n._setColor(value)
+                self._colorOverrides = dict.fromkeys(range(self._length), value)
+                self._clearNotes()
             else:
                 raise MedRenException('color %s not supported for ligatures' % value)
     
@@ -1164,8 +1303,8 @@ class Ligature(base.Music21Object):
         if index == 'None' or index == 'none':
             index = None
         if index != None:
-            if index < self._ligatureLength():
-                return self.notes[index]._getNoteheadFill()
+            if 0 <= index < self._length:
+                return self._fillOverrides.get(index, 'default')
             else:
                 raise MedRenException('no note exists at index %d' % index) 
         else:
@@ -1191,25 +1330,31 @@ class Ligature(base.Music21Object):
         if index == 'None' or index == 'none':
             index = None
         if index != None:
-            if index < self._ligatureLength():
+            if 0 <= index < self._length:
                 if value != tempFillStatus:
+                    # the same values note.NotRest.noteheadFill accepts
+                    if value == 'none':
+                        value = None
+                    elif value == 'filled':
+                        value = 'yes'
+                    elif value not in _noteheadFillValues:
+                        raise MedRenException('fillStatus %s not supported for mensural notes' % value)
                     self.filled = 'mixed'
-                    self.notes[index]._setNoteheadFill(value)
+                    self._fillOverrides[index] = value
+                    self._clearNotes()
             else:
                 raise MedRenException('no note exists at index %d' % index)
         else:
-            if value in ['yes','fill','filled']:
+            if value in _filledValues:
                 value = 'yes'
                 self.filled = value
-                for n in self.notes:
-                    n._setNoteheadFill(value)
-            elif value in ['no', 'empty']:
+            elif value in _emptyValues:
                 value = 'no'
                 self.fill = value
-                for note in self.notes:
-                    note._setNoteheadFill(value)
             else:
                 raise MedRenException('fillStatus %s not supported for ligatures' % value)
+            self._fillOverrides = dict.fromkeys(range(self._length), value)
+            self._clearNotes()
                     
     
     def getNoteheadShape(self, index):
@@ -1218,7 +1363,7 @@ class Ligature(base.Music21Object):
         
         Returns the notehead shape (either square or oblique) of the note at index
         '''
-        if index < self._ligatureLength():
+        if 0 <= index < self._length:
             return self.noteheadShape[index][0]
         else:
             raise MedRenException('no note exists at index %d' % index)
@@ -1248,7 +1393,7 @@ class Ligature(base.Music21Object):
         Traceback (most recent call last):
         MedRenException: no note exists at index 4
         '''
-        if startIndex < self._ligatureLength() - 1:
+        if 0 <= startIndex < self._length - 1:
             currentShape = self.noteheadShape[startIndex]
             nextShape = self.noteheadShape[startIndex+1]
             if  ((currentShape == ('oblique','end') or nextShape == ('oblique', 'start')) or
@@ -1260,7 +1405,7 @@ class Ligature(base.Music21Object):
                 self.noteheadShape[startIndex+1] = ('oblique', 'end')
         else:
             raise MedRenException('no note exists at index %d' % (startIndex+1))
-        self._notes = []
+        self._clearNotes()
     
     def makeSquare(self, index):
         '''
@@ -1277,7 +1422,7 @@ class Ligature(base.Music21Object):
         >>> l.getNoteheadShape(1)
         'square'
         '''
-        if index < self._ligatureLength():
+        if 0 <= index < self._length:
             currentShape = self.noteheadShape[index]
             if currentShape[0] == 'oblique':
                 self.noteheadShape[index] = 'square',
@@ -1289,7 +1434,7 @@ class Ligature(base.Music21Object):
                 pass #Already square
         else:
             raise MedRenException('no note exists at index %d' % index)
-        self._notes = []
+        self._clearNotes()
     
     def isMaxima(self, index):
         '''
@@ -1297,7 +1442,7 @@ class Ligature(base.Music21Object):
         
         If the note at index is a maxima, returns True. Otherwise, it returns False.
         '''
-        if index < self._ligatureLength():
+        if 0 <= index < self._length:
             return self.maximaNotes[index]
         else:
             raise MedRenException('no note exists at index %d' % index)
@@ -1326,26 +1471,27 @@ class Ligature(base.Music21Object):
         >>> l.isMaxima(2)
         False
         '''
-        if index < self._ligatureLength():
-            if value == True or value == 'True' or value == 'true':
+        if 0 <= index < self._length:
+            normalizedValue = _booleanValues.get(value, _unrecognized)
+            if normalizedValue is True:
                 if (self.getNoteheadShape(index) == 'oblique') or (self.getStem(index) != (None, None)) or (index > 0 and self.getStem(index-1)[0] == 'up'):
                     raise MedRenException('cannot make note at index %d a maxima' % index)
                 else:
-                    self.maximaNotes[index] = value
-            elif value == False or value == 'False' or value == 'false':
-                self.maximaNotes[index] = value
+                    self.maximaNotes[index] = True
+            elif normalizedValue is False:
+                self.maximaNotes[index] = False
             else:
                 raise MedRenException('%s is not a valid value' % value)
         else:
             raise MedRenException('no note exists at index %d' % index)
-        self._notes = []
+        self._clearNotes()
     
     def getStem(self, index):
         '''
         Takes one argument: index
         If the note at index has a stem, it returns direction (up or down) and orientation (left, right)
         '''
-        if index < self._ligatureLength():
+        if 0 <= index < self._length:
             return self.stems[index]
         else:
             raise MedRenException('no note exists at index %d' % index)
@@ -1372,6 +1518,10 @@ class Ligature(base.Music21Object):
         >>> l.setStem(1,'up', 'left')
         >>> l.getStem(1)
         ('up', 'left')
+        >>> l.setStem(1, 'none', 'none')
+        >>> l.getStem(1)
+        (None, None)
+        >>> l.setStem(1,'up', 'left')
         >>> l.setStem(2, 'down', 'right')
         Traceback (most recent call last):
         MedRenException: a stem with direction down not permitted at index 2
@@ -1385,52 +1535,56 @@ class Ligature(base.Music21Object):
         '''
         if direction == 'None' or direction == 'none':
             direction = None
-        if orientation == 'None' or direction == 'none':
-            index = None
-        if index < self._ligatureLength():
-            if self.isMaxima(index):
-                raise MedRenException('cannot place stem at index %d' % index)
-            else:
-                if orientation == None and direction == None:
-                    self.stems[index] = (direction, orientation)
-                elif orientation in ['left', 'right']:
-                    if index == 0:
-                        prevStem = (None,None)
-                        nextStem = self.getStem(1)
-                    elif index == self._ligatureLength() - 1:
-                        prevStem = self.getStem(self._ligatureLength()-2)
-                        nextStem = (None,None)
-                    else:
-                        prevStem = self.getStem(index-1)
-                        nextStem = self.getStem(index+1)
-                    if (orientation == 'left' and prevStem[1] != 'right') or (orientation == 'right' and nextStem[1] != 'left'):
-                        if direction == 'down':
-                            if prevStem[0] != 'up':
-                                self.stems[index] = (direction, orientation)
-                            else:
-                                raise MedRenException('a stem with direction %s not permitted at index %d' % (direction, index))
-                        elif direction == 'up':
-                            if (index < self._ligatureLength()-1) and (prevStem[0] != 'up') and (nextStem[0] == None) and not self.isMaxima(index+1):
-                                self.stems[index] = (direction, orientation)
-                            else:
-                                raise MedRenException('a stem with direction %s not permitted at index %d' % (direction, index))
-                        else:
-                            raise MedRenException('direction %s and orientation %s not supported for ligatures' % (direction, orientation))
-                    else:
-                        raise MedRenException('a stem with orientation %s not permitted at index %d' % (orientation,index))
-                else:
-                    raise MedRenException('direction %s and orientation %s not supported for ligatures' % (direction,orientation))
+        if orientation == 'None' or orientation == 'none':
+            orientation = None
+        if 0 <= index < self._length:
+            self.stems[index] = self._validateStem(self.stems, self.maximaNotes, index, direction, orientation)
         else:
             raise MedRenException('no note exists at index %d' % index)
-        self._notes = []     
+        self._clearNotes()
        
+    @staticmethod
+    def _validateStem(stems, maximaNotes, index, direction, orientation):
+        '''
+        Checks a stem of direction and orientation against the stems and maxima of the rest of the ligature.
+        Returns the (direction, orientation) pair to store at index, or raises a MedRenException if the stem is not permitted there.
+        '''
+        if maximaNotes[index]:
+            raise MedRenException('cannot place stem at index %d' % index)
+        if orientation == None and direction == None:
+            return (None, None)
+        if orientation not in _stemOrientations:
+            raise MedRenException('direction %s and orientation %s not supported for ligatures' % (direction, orientation))
+        
+        length = len(stems)
+        # the ends of the ligature count as unstemmed neighbors
+        prevStem = nextStem = (None, None)
+        if index > 0:
+            prevStem = stems[index-1]
+        if index < length - 1:
+            nextStem = stems[index+1]
+        elif index == 0:
+            raise MedRenException('no note exists at index 1')
+        if not ((orientation == 'left' and prevStem[1] != 'right') or (orientation == 'right' and nextStem[1] != 'left')):
+            raise MedRenException('a stem with orientation %s not permitted at index %d' % (orientation, index))
+        
+        if direction == 'down':
+            permitted = (prevStem[0] != 'up')
+        elif direction == 'up':
+            permitted = (index < length-1) and (prevStem[0] != 'up') and (nextStem[0] == None) and not maximaNotes[index+1]
+        else:
+            raise MedRenException('direction %s and orientation %s not supported for ligatures' % (direction, orientation))
+        if not permitted:
+            raise MedRenException('a stem with direction %s not permitted at index %d' % (direction, index))
+        return (direction, orientation)
+    
     def isReversed(self, index):
         '''
         Takes one argument: index.
         
         If the note at index is reversed, returns True. Otherwise, it returns False.
         '''
-        if index < self._ligatureLength():
+        if 0 <= index < self._length:
             return self.reversedNotes[index]
         else:
             raise MedRenException('no note exists at index %d' % index)
@@ -1462,109 +1616,250 @@ class Ligature(base.Music21Object):
         Traceback (most recent call last):
         MedRenException: the note at index 3 cannot be given reverse value True
         '''
-        if value == 'True' or value == 'true':
-            value = True
-        if value == 'False' or value == 'false':
-            value = False
+        value = _booleanValues.get(value, value)
             
-        if endIndex < self._ligatureLength():
-            if value in [True, False]:
+        if 0 <= endIndex < self._length:
+            if value is True or value is False:
+                if self.reversedNotes[endIndex] == value:
+                    return
                 if not value:
                     self.reversedNotes[endIndex] = value
                 else:
                     if endIndex > 0:
-                        tempPitchCurrent = copy.copy(self.pitches[endIndex])
-                        tempPitchPrev = copy.copy(self.pitches[endIndex-1])
-                       
-                        tempPitchCurrent._setAccidental(None)
-                        tempPitchPrev._setAccidental(None)
-                        if (not self.isReversed(endIndex-1)) and (self.getStem(endIndex-1)[0] != 'up') and (self.getStem(endIndex) == ('down','left')) and (tempPitchCurrent > tempPitchPrev):
+                        # diatonicNoteNum ignores accidentals: only staff positions are compared
+                        pitches = self.pitches
+                        if (not self.isReversed(endIndex-1)) and (self.getStem(endIndex-1)[0] != 'up') and (self.getStem(endIndex) == ('down','left')) and (pitches[endIndex].diatonicNoteNum > pitches[endIndex-1].diatonicNoteNum):
                                 self.reversedNotes[endIndex] = True
                         else:                           
                             raise MedRenException('the note at index %d cannot be given reverse value %s' % (endIndex, value))
                     else:
                         raise MedRenException('no note exists at index %d' % (endIndex-1)) 
             else:
-                raise MedRenException('reverse value %s not supported for ligatures %' % value)
+                raise MedRenException('reverse value %s not supported for ligatures' % value)
         else:
             raise MedRenException('no note exists at index %d' % endIndex)
     
+    def applyEdits(self, edits):
+        '''
+        Takes one argument: edits.
+        
+        edits is a dictionary with any of the keys 'shapes', 'stems', 'maxima' and 'reverse', each mapping note indices to values:
+        'oblique' or 'square' for shapes (an oblique notehead starts at its index), a (direction, orientation) tuple for stems, and True or False for maxima and reverse.
+        The edits are applied in that order, and by index within each kind, exactly as :meth:`~music21.medren.Ligature.makeOblique`, :meth:`~music21.medren.Ligature.makeSquare`, 
+        :meth:`~music21.medren.Ligature.setStem`, :meth:`~music21.medren.Ligature.setMaxima` and :meth:`~music21.medren.Ligature.setReverse` would apply them.
+        If any edit is not permitted, the ligature is left as it was and the exception is raised.
+        
+        
+        >>> l = medren.Ligature(['B4','A4','G4','A4','G4','A4','F4'])
+        >>> l.applyEdits({'shapes': {0: 'oblique', 4: 'oblique'}, 'stems': {2: ('down', 'left'), 4: ('up', 'left')}, 'maxima': {6: True}})
+        >>> print [n.mensuralType for n in l.notes]
+        ['longa', 'brevis', 'longa', 'brevis', 'semibrevis', 'semibrevis', 'maxima']
+        >>> l.applyEdits({'stems': {0: ('up', 'left')}, 'maxima': {5: True}})
+        Traceback (most recent call last):
+        MedRenException: cannot make note at index 5 a maxima
+        >>> l.getStem(0)
+        (None, None)
+        '''
+        for kind in edits:
+            if kind not in ('shapes', 'stems', 'maxima', 'reverse'):
+                raise MedRenException('edits of kind %s not supported for ligatures' % kind)
+        
+        previousState = (list(self.noteheadShape), list(self.stems), list(self.maximaNotes), list(self.reversedNotes))
+        try:
+            for index, shape in sorted(edits.get('shapes', {}).items()):
+                if shape == 'oblique':
+                    self.makeOblique(index)
+                elif shape == 'square':
+                    self.makeSquare(index)
+                else:
+                    raise MedRenException('notehead shape %s not supported for ligatures' % shape)
+            for index, (direction, orientation) in sorted(edits.get('stems', {}).items()):
+                self.setStem(index, direction, orientation)
+            for index, value in sorted(edits.get('maxima', {}).items()):
+                self.setMaxima(index, value)
+            for index, value in sorted(edits.get('reverse', {}).items()):
+                self.setReverse(index, value)
+        except:
+            self.noteheadShape, self.stems, self.maximaNotes, self.reversedNotes = previousState
+            self._clearNotes()
+            raise
+    
     def _expandLigature(self):
         '''
         Given pitch, notehead, and stem information, assigns a mensural note to each note of the ligature.
-        '''
         
-        ind = 0
-        notes = []
+        Pitches are read as they are now, so pitches changed in place are taken into account.
         
-        if self._ligatureLength() < 2:
+        >>> l = medren.Ligature(['A4','B4','G4'])
+        >>> l.pitches[1].nameWithOctave = 'F3'
+        >>> l.setStem(0, 'down', 'left')
+        >>> [n.mensuralType for n in l._expandLigature()]
+        ['brevis', 'brevis', 'brevis']
+        '''
+        if self._length < 2:
             raise MedRenException('Ligatures must contain at least two notes')
-            
-        if self.getStem(ind)[0] == 'up':
-            notes.append(MensuralNote(self.pitches[ind], 'semibrevis'))
-            notes.append(MensuralNote(self.pitches[ind+1], 'semibrevis'))
+        # pitch-space values are taken once per expansion, so classification compares plain numbers
+        pitchSpaces = [p.ps for p in self._pitches]
+        mensuralTypes = self._classifyNotes(self.stems, self.maximaNotes, self.noteheadShape, pitchSpaces)
+        
+        # a note whose pitch and type did not change is kept from the previous expansion,
+        # unless the caller has since placed it in a stream
+        previousNotes = self._notes
+        numPrevious = len(previousNotes)
+        notes = []
+        append = notes.append
+        newNote = MensuralNote
+        for ind, (p, mensuralType) in enumerate(zip(self.pitches, mensuralTypes)):
+            if ind < numPrevious:
+                previous = previousNotes[ind]
+                if (previous.pitch is p and previous._mensuralType == mensuralType and
+                        previous.sites.getSiteCount() == 1): # only the None site
+                    append(previous)
+                    continue
+            append(newNote(p, mensuralType))
+        for ind, value in self._colorOverrides.items():
+            notes[ind]._setColor(value)
+        for ind, value in self._fillOverrides.items():
+            notes[ind]._setNoteheadFill(value)
+        return notes
+    
+    @staticmethod
+    def _classifyNotes(stems, maximaNotes, noteheadShape, pitchSpaces):
+        '''
+        Returns the mensural type of each note of a ligature (of at least two notes), in order, 
+        from its stems, maxima, notehead shapes and pitch-space values alone.
+        '''
+        ind = 0
+        mensuralTypes = []
+        append = mensuralTypes.append
+        length = len(stems)
+        
+        if stems.count((None, None)) == length and noteheadShape.count(('square',)) == length and True not in maximaNotes:
+            # the common case of a plain ligature, without stems, oblique noteheads or maxima:
+            # only the first and last notes depend on the direction of the line
+            mensuralTypes = ['brevis'] * length
+            if pitchSpaces[1] < pitchSpaces[0]:
+                mensuralTypes[0] = 'longa'
+            if not pitchSpaces[-2] < pitchSpaces[-1]:
+                mensuralTypes[-1] = 'longa'
+            return mensuralTypes
+        
+        if stems[ind][0] == 'up':
+            append('semibrevis')
+            append('semibrevis')
             ind += 2
-        elif self.getStem(ind)[0] == 'down':
-            if self.getNoteheadShape(ind) == 'oblique':
-                notes.append(MensuralNote(self.pitches[ind], 'brevis'))
-            else:
-                if self.pitches[ind+1] < self.pitches[ind]:
-                    notes.append(MensuralNote(self.pitches[ind], 'brevis'))
-                else:
-                    notes.append(MensuralNote(self.pitches[ind], 'longa'))
-            ind += 1
         else:
-            if self.isMaxima(ind):
-                notes.append(MensuralNote(self.pitches[ind], 'maxima'))
+            stemDown = (stems[ind][0] == 'down')
+            if maximaNotes[ind] and not stemDown:
+                append('maxima')
             else:
-                if self.getNoteheadShape(ind) == 'oblique':
-                    notes.append(MensuralNote(self.pitches[ind], 'longa'))
-                else:
-                    if self.pitches[ind+1] < self.pitches[ind]:
-                        notes.append(MensuralNote(self.pitches[ind], 'longa'))
-                    else:
-                        notes.append(MensuralNote(self.pitches[ind], 'brevis'))
+                append(_ligatureEndTypes[(True, stemDown, 
+                                          noteheadShape[ind][0] == 'oblique' or pitchSpaces[ind+1] < pitchSpaces[ind])])
             ind += 1
             
-        while ind < self._ligatureLength()-1:
-            if self.getStem(ind)[0] == 'up':
-                notes.append(MensuralNote(self.pitches[ind],  'semibrevis'))
-                notes.append(MensuralNote(self.pitches[ind+1], 'semibrevis'))
+        while ind < length-1:
+            direction = stems[ind][0]
+            if direction == 'up':
+                append('semibrevis')
+                append('semibrevis')
                 ind += 2
-            elif self.getStem(ind)[0] == 'down':
-                notes.append(MensuralNote(self.pitches[ind], 'longa'))
+            elif direction == 'down':
+                append('longa')
                 ind += 1
             else:
-                if self.isMaxima(ind):
-                    notes.append(MensuralNote(self.pitches[ind], 'maxima'))
+                if maximaNotes[ind]:
+                    append('maxima')
                 else:
-                    notes.append(MensuralNote(self.pitches[ind], 'brevis'))
+                    append('brevis')
                 ind += 1
         
-        if ind == self._ligatureLength() - 1:
-            if self.getStem(ind)[0] == 'down':
-                if self.getNoteheadShape(ind) == 'oblique':
-                    notes.append(MensuralNote(self.pitches[ind], 'longa'))
-                else:
-                    if self.pitches[ind-1] < self.pitches[ind]:
-                        notes.append(MensuralNote(self.pitches[ind], 'longa'))
-                    else:
-                        notes.append(MensuralNote(self.pitches[ind], 'brevis'))
+        if ind == length - 1:
+            stemDown = (stems[ind][0] == 'down')
+            if maximaNotes[ind] and not stemDown:
+                append('maxima')
             else:
-                if self.isMaxima(ind):
-                    notes.append(MensuralNote(self.pitches[ind], 'maxima'))
-                else:
-                    if self.getNoteheadShape(ind) == 'oblique':
-                        notes.append(MensuralNote(self.pitches[ind], 'brevis'))
-                    else:
-                        if self.pitches[ind-1] < self.pitches[ind]:
-                            notes.append(MensuralNote(self.pitches[ind], 'brevis'))
-                        else:
-                            notes.append(MensuralNote(self.pitches[ind], 'longa'))
+                append(_ligatureEndTypes[(False, stemDown, 
+                                          noteheadShape[ind][0] == 'oblique' or pitchSpaces[ind-1] < pitchSpaces[ind])])
             
-        return notes
+        return mensuralTypes
     
 #--------------------------------------------------------------------------------------------------------        
+_brevisBreakKinds = {} # element class: kind, filled in by _getBrevisBreakKind
+
+def _getBrevisBreakKind(e):
+    '''
+    Returns how :meth:`music21.medren.breakMensuralStreamIntoBrevisLengths` treats the element e:
+    'clef', 'mensuration' (a mensuration or divisione), 'ligature', 'note' (any general mensural note), or None. 
+    The answer depends only on the class of e, so it is worked out once per class.
+    
+    
+    >>> medren._getBrevisBreakKind(trecento.notation.Divisione('.p.'))
+    'mensuration'
+    >>> medren._getBrevisBreakKind(medren.MensuralRest('SB'))
+    'note'
+    >>> print medren._getBrevisBreakKind(note.Note('A'))
+    None
+    '''
+    eClass = e.__class__
+    if eClass in _brevisBreakKinds:
+        return _brevisBreakKinds[eClass]
+    classes = e.classes
+    if 'MensuralClef' in classes:
+        kind = 'clef'
+    elif ('Mensuration' in classes) or ('Divisione' in classes):
+        kind = 'mensuration'
+    elif 'Ligature' in classes:
+        kind = 'ligature'
+    elif 'GeneralMensuralNote' in classes:
+        kind = 'note'
+    else:
+        kind = None
+    _brevisBreakKinds[eClass] = kind
+    return kind
+
+# rank of each stream type in the hierarchy that breakMensuralStreamIntoBrevisLengths allows
+_streamHierarchyRanks = {'Stream': 0, 'Score': 1, 'Part': 2, 'Measure': 3}
+_streamClassRanks = {} # stream class: rank, filled in by _getStreamHierarchyRank
+
+def _getStreamHierarchyRank(s):
+    '''
+    Returns the rank in _streamHierarchyRanks of the first of s's classes that appears there, worked out once per class.
+    
+    
+    >>> medren._getStreamHierarchyRank(stream.Part())
+    2
+    >>> medren._getStreamHierarchyRank(stream.Voice())
+    0
+    '''
+    sClass = s.__class__
+    if sClass in _streamClassRanks:
+        return _streamClassRanks[sClass]
+    for className in s.classes:
+        if className in _streamHierarchyRanks:
+            rank = _streamHierarchyRanks[className]
+            break
+    else:
+        raise MedRenException("Cannot find class in our hierarchy of streams: %s" % (s))
+    _streamClassRanks[sClass] = rank
+    return rank
+
+def _isHigherInHierarchy(l, uRank):
+    '''
+    Returns True if stream l may not be placed within a stream of rank uRank (from :func:`_getStreamHierarchyRank`): 
+    that is, if l is of the same or higher type. Any type may be placed within a plain stream.
+    The rank is passed in so that it is looked up once for all the elements of a stream.
+    
+    
+    >>> medren._isHigherInHierarchy(stream.Score(), medren._getStreamHierarchyRank(stream.Part()))
+    True
+    >>> medren._isHigherInHierarchy(stream.Score(), medren._getStreamHierarchyRank(stream.Stream()))
+    False
+    '''
+    if uRank == 0:
+        return False
+    else:
+        return _getStreamHierarchyRank(l) <= uRank
+
 def breakMensuralStreamIntoBrevisLengths(inpStream, inpMOrD = None, printUpdates = False):
     '''
     Takes a stream as an argument. Takes a mensuration or divisione object as an optional argument.
@@ -1633,56 +1928,60 @@ def breakMensuralStreamIntoBrevisLengths(inpStream, inpMOrD = None, printUpdates
             {0.0} <music21.medren.MensuralNote brevis C>
     {0.0} <music21.stream.Measure...> 
         {0.0} <music21.medren.MensuralNote brevis G> 
-    '''
     
+    A ligature is broken up into the notes it stands for. With an upstem on its first note,
+    those notes begin with two semibreves, which share a measure:
+    
+    >>> p = stream.Part()
+    >>> p.append(trecento.notation.Divisione('.p.'))
+    >>> l = medren.Ligature(['A4','B4','C5','D5'])
+    >>> l.setStem(0, 'up', 'left')
+    >>> p.append(l)
+    >>> medren.breakMensuralStreamIntoBrevisLengths(p).show('text')
+    {0.0} <music21.trecento.notation.Divisione .p.>
+    {0.0} <music21.stream.Measure 0 offset=0.0>
+        {0.0} <music21.medren.MensuralNote semibrevis A>
+        {0.0} <music21.medren.MensuralNote semibrevis B>
+    {0.0} <music21.stream.Measure 1 offset=0.0>
+        {0.0} <music21.medren.MensuralNote brevis C>
+    {0.0} <music21.stream.Measure 2 offset=0.0>
+        {0.0} <music21.medren.MensuralNote brevis D>
+    '''
+    inpStream_copy = copy.deepcopy(inpStream) #Preserve your input
+    return _breakCopiedStreamIntoBrevisLengths(inpStream_copy, inpMOrD, printUpdates)
+
+def _breakCopiedStreamIntoBrevisLengths(inpStream_copy, inpMOrD, printUpdates):
+    '''
+    Does the work of :meth:`music21.medren.breakMensuralStreamIntoBrevisLengths` on a stream that is already a private copy. 
+    Substreams are part of that copy, so they are broken up as they are rather than copied again at every level.
+    '''
     mOrD = inpMOrD
     mOrDInAsNone = True
     if mOrD is not None:
         mOrDInAsNone = False
     
-    inpStream_copy = copy.deepcopy(inpStream) #Preserve your input
-    newStream = inpStream.__class__()
+    newStream = inpStream_copy.__class__()
          
-    def isHigherInhierarchy(l, u):
-        hierarchy = ['Stream', 'Score',  'Part', 'Measure']
-        uclass0 = None
-        for tryClass in u.classes:
-            if tryClass in hierarchy:
-                uclass0 = tryClass
-                break
-
-        lclass0 = None
-        for tryClass in l.classes:
-            if tryClass in hierarchy:
-                lclass0 = tryClass
-                break
-
-
-        if uclass0 is None:
-            raise MedRenException("Cannot find class in our hierarchy of streams: %s" % (u))
-        if lclass0 is None:
-            raise MedRenException("Cannot find class in our hierarchy of streams: %s" % (l))
-            
-        if hierarchy.index(uclass0) == 0:
-            return False
-        else:
-            return hierarchy.index(lclass0) <= hierarchy.index(uclass0)
-    
-    tempStream_1, tempStream_2 = inpStream_copy.splitByClass(None, lambda x: x.isStream)
-    if len(tempStream_1) > 0:
+    # isFlat is kept up to date as elements change, so leaf streams need not be split at all
+    hasSubstreams = not inpStream_copy.isFlat
+    if hasSubstreams:
+        tempStream_1, tempStream_2 = inpStream_copy.splitByClass(None, lambda x: x.isStream)
+        hasSubstreams = len(tempStream_1) > 0
+    if hasSubstreams:
         if len(tempStream_2) > 0 and tempStream_2.hasElementOfClass(GeneralMensuralNote):
             raise MedRenException('cannot combine objects of type %s, %s within stream' % (tempStream_1[0].__class__, tempStream_2[0].__class__))
         else:
             for item in tempStream_2:
                 
                 newStream.append(item)
-                if ('Mensuration' in item.classes) or ('Divisione' in item.classes):
+                if _getBrevisBreakKind(item) == 'mensuration':
                     if mOrDInAsNone: #If first case or changed mOrD
                         mOrD = item
                     elif mOrD.standardSymbol != item.standardSymbol: #If higher, different mOrD found
                         raise MedRenException('Mensuration or divisione %s not consistent within hierarchy' % item)
                     
-            tempStream_1_1, tempStream_1_2 = tempStream_1.splitByClass(None, lambda x: isHigherInhierarchy(x, tempStream_1))
+            tempStream_1Rank = _getStreamHierarchyRank(tempStream_1)
+            tempStream_1_1, tempStream_1_2 = tempStream_1.splitByClass(None, lambda x: _isHigherInHierarchy(x, tempStream_1Rank))
             if len(tempStream_1_1) > 0:
                 raise MedRenException('Hierarchy of %s violated by %s' % (tempStream_1.__class__, tempStream_1_1[0].__class__))
             elif len(tempStream_1_2) > 0:
@@ -1691,36 +1990,38 @@ def breakMensuralStreamIntoBrevisLengths(inpStream, inpMOrD = None, printUpdates
                     if e.isMeasure:
                         newStream.append(e)
                     else:
-                        newStream.append(breakMensuralStreamIntoBrevisLengths(e, mOrD, printUpdates))
+                        newStream.append(_breakCopiedStreamIntoBrevisLengths(e, mOrD, printUpdates))
     else:
         measureNum = 0
         mensuralMeasure = []
+        measuredIds = set() # id() of every note already placed in a measure
         
         for e in inpStream_copy:
-            
-            if 'MensuralClef' in e.classes:
+            kind = _getBrevisBreakKind(e)
+            if kind == 'clef':
                 newStream.append(e)
-            elif ('Mensuration' in e.classes) or ('Divisione' in e.classes):
+            elif kind == 'mensuration':
                 if mOrDInAsNone: #If first case or changed mOrD
                         mOrD = e
                         newStream.append(e)
                 elif mOrD.standardSymbol != e.standardSymbol: #If higher, different mOrD found 
                     raise MedRenException('Mensuration or divisione %s not consistent within hierarchy' % e)
-            elif 'Ligature' in e.classes:
+            elif kind == 'ligature':
+                # the ligature is part of the private copy, so its expanded notes can be used as they are
                 tempStream = stream.Stream()
-                for mn in e.notes:
-                    tempStream.append(mn)
-                for m in breakMensuralStreamIntoBrevisLengths(tempStream, printUpdates):
+                tempStream.append(e.notes)
+                for m in _breakCopiedStreamIntoBrevisLengths(tempStream, mOrD, printUpdates):
                     newStream.append(m)
-            elif ('GeneralMensuralNote' in e.classes) and (e not in mensuralMeasure):
+            elif (kind == 'note') and (id(e) not in measuredIds):
                 m = stream.Measure(number = measureNum)
                 if printUpdates is True:
-                    print 'Getting measure %s...' % measureNum
+                    print('Getting measure %s...' % measureNum)
                 mensuralMeasure = e._getSurroundingMeasure(mOrD, inpStream_copy)[0]
                 if printUpdates is True:               
-                    print 'mensuralMeasure %s' % mensuralMeasure
+                    print('mensuralMeasure %s' % mensuralMeasure)
                 for item in mensuralMeasure:
                     m.append(item)
+                    measuredIds.add(id(item))
                 newStream.append(m)
                 measureNum += 1 
             
@@ -1741,7 +2042,8 @@ def setBarlineStyle(score, newStyle, oldStyle = 'regular', inPlace = True):
         score = copy.deepcopy(score)
     
     oldStyle = oldStyle.lower()
-    for m in score.semiFlat:
+    # only streams can be measures, so there is no need to build the semiFlat of every element
+    for m in score.recurse(streamsOnly=True):
         if isinstance(m, stream.Measure):
             barline = m.rightBarline
             if barline is None:
@@ -1760,11 +2062,22 @@ def scaleDurations(score, scalingNum = 1, inPlace = True, scaleUnlinked = True):
     if inPlace is False:
         score = copy.deepcopy(score)
 
-    for el in score.recurse():
+    _scaleElementDurations(score.recurse(), scalingNum, scaleUnlinked)
+    for p in score.parts:
+        p.makeBeams(inPlace=True)
+    return score
+
+def _scaleElementDurations(elements, scalingNum, scaleUnlinked):
+    '''
+    does the work of :func:`~music21.medren.scaleDurations` on an already
+    recursed list of elements, so that callers can share a single walk of the score.
+    '''
+    for el in elements:
         el.offset = el.offset * scalingNum
-        if el.duration is not None:
-            el.duration.quarterLength = el.duration.quarterLength * scalingNum
-            if hasattr(el.duration, 'linkStatus') and el.duration.linkStatus is False and scaleUnlinked is True:
+        elDuration = el.duration # a property; read it once
+        if elDuration is not None:
+            elDuration.quarterLength = elDuration.quarterLength * scalingNum
+            if hasattr(elDuration, 'linkStatus') and elDuration.linkStatus is False and scaleUnlinked is True:
                 raise MedRenException('scale unlinked is not yet supported')
         if isinstance(el, tempo.MetronomeMark):
             el.value = el.value * scalingNum
@@ -1780,10 +2093,6 @@ def scaleDurations(score, scalingNum = 1, inPlace = True, scaleUnlinked = True):
                     raise MedRenException('cannot create a scaling of the TimeSignature for this ratio')
             newDem = int(newDem)
             el.loadRatio(newNum, newDem)
-    
-    for p in score.parts:
-        p.makeBeams(inPlace=True)
-    return score
 
 def transferTies(score, inPlace=True):
     '''
@@ -1794,40 +2103,90 @@ def transferTies(score, inPlace=True):
     '''
     if inPlace is False:
         score = copy.deepcopy(score)
+    _transferTiesOnElements(score.recurse())
+    return score
+
+# tied quarter lengths and ratios repeat throughout a piece, so their answers are kept
+_simpleQuarterLengths = {} # quarterLength: whether it is a single untupleted duration
+_tupletRatios = {} # ratio: (actual, normal) from common.decimalToTuplet
+# the float keys vary from score to score, so both are emptied when they fill
+_quarterLengthCacheLimit = 128
+
+def _isSimpleQuarterLength(quarterLength):
+    '''
+    Returns True if quarterLength can be written as a single duration without tuplets.
+    
+    >>> medren._isSimpleQuarterLength(3.0)
+    True
+    >>> medren._isSimpleQuarterLength(5.0)
+    False
+    >>> medren._isSimpleQuarterLength(1/3.0)
+    False
+    '''
+    if quarterLength in _simpleQuarterLengths:
+        return _simpleQuarterLengths[quarterLength]
+    tempDuration = duration.Duration(quarterLength)
+    isSimple = (tempDuration.type != 'complex' and len(tempDuration.tuplets) == 0)
+    if len(_simpleQuarterLengths) >= _quarterLengthCacheLimit:
+        _simpleQuarterLengths.clear()
+    _simpleQuarterLengths[quarterLength] = isSimple
+    return isSimple
+
+def _getTupletRatio(ratioDecimal):
+    '''
+    Returns common.decimalToTuplet(ratioDecimal), working each ratio out only once.
+    
+    >>> medren._getTupletRatio(1.5)
+    (3, 2)
+    >>> medren._getTupletRatio(1.5) is medren._getTupletRatio(1.5)
+    True
+    '''
+    if ratioDecimal in _tupletRatios:
+        return _tupletRatios[ratioDecimal]
+    ratio = common.decimalToTuplet(ratioDecimal)
+    if len(_tupletRatios) >= _quarterLengthCacheLimit:
+        _tupletRatios.clear()
+    _tupletRatios[ratioDecimal] = ratio
+    return ratio
+
+def _transferTiesOnElements(elements):
+    '''
+    does the work of :func:`~music21.medren.transferTies` on an already
+    recursed list of elements, so that callers can share a single walk of the score.
+    '''
+    # only tied notes take part, and scores without any ties can be left alone at once
+    tiedElements = [el for el in elements if isinstance(el, note.Note) and el.tie is not None]
+    if len(tiedElements) == 0:
+        return
     tiedNotes = []
     tieBeneficiary = None 
-    for el in score.recurse():
-        if not isinstance(el, note.Note):
-            continue
-        if el.tie is not None:
-            if el.tie.type == 'start':
-                tieBeneficiary = el
-            elif el.tie.type == 'continue':
-                tiedNotes.append(el)
-            elif el.tie.type == 'stop':
-                tiedNotes.append(el)
-                tiedQL = tieBeneficiary.duration.quarterLength
-                for tiedEl in tiedNotes:
-                    tiedQL += tiedEl.duration.quarterLength
-                tempDuration = duration.Duration(tiedQL)
-                if (tempDuration.type != 'complex' and 
-                    len(tempDuration.tuplets) == 0):
-                    # successfully can combine these notes into one unit
-                    ratioDecimal = tiedQL/float(tieBeneficiary.duration.quarterLength)
-                    (tupAct, tupNorm) = common.decimalToTuplet(ratioDecimal)
-                    if (tupAct != 0): # error...
-                        tempTuplet = duration.Tuplet(tupAct, tupNorm, copy.deepcopy(tempDuration.components[0]))
-                        tempTuplet.tupletActualShow = "none"
-                        tempTuplet.bracket = False
-                        tieBeneficiary.duration = tempDuration
-                        tieBeneficiary.duration.tuplets = (tempTuplet,)
-                        tieBeneficiary.tie = None #.style = 'hidden'
-                        for tiedEl in tiedNotes:
-                            tiedEl.tie = None #.style = 'hidden'
-                            tiedEl.hideObjectOnPrint = True
-                tiedNotes = []
-
-    return score
+    for el in tiedElements:
+        tieType = el.tie.type
+        if tieType == 'start':
+            tieBeneficiary = el
+        elif tieType == 'continue':
+            tiedNotes.append(el)
+        elif tieType == 'stop':
+            tiedNotes.append(el)
+            tiedQL = tieBeneficiary.duration.quarterLength
+            for tiedEl in tiedNotes:
+                tiedQL += tiedEl.duration.quarterLength
+            if _isSimpleQuarterLength(tiedQL):
+                # successfully can combine these notes into one unit
+                ratioDecimal = tiedQL/float(tieBeneficiary.duration.quarterLength)
+                (tupAct, tupNorm) = _getTupletRatio(ratioDecimal)
+                if (tupAct != 0): # error...
+                    tempDuration = duration.Duration(tiedQL)
+                    tempTuplet = duration.Tuplet(tupAct, tupNorm, copy.deepcopy(tempDuration.components[0]))
+                    tempTuplet.tupletActualShow = "none"
+                    tempTuplet.bracket = False
+                    tieBeneficiary.duration = tempDuration
+                    tieBeneficiary.duration.tuplets = (tempTuplet,)
+                    tieBeneficiary.tie = None #.style = 'hidden'
+                    for tiedEl in tiedNotes:
+                        tiedEl.tie = None #.style = 'hidden'
+                        tiedEl.hideObjectOnPrint = True
+            tiedNotes = []
 
 def convertHouseStyle(score, durationScale = 2, barlineStyle = 'tick', tieTransfer = True, inPlace = False):
     '''
@@ -1861,45 +2220,58 @@ def convertHouseStyle(score, durationScale = 2, barlineStyle = 'tick', tieTransf
     
     if inPlace is False:
         score = copy.deepcopy(score)
+    # neither step adds or removes elements, so one walk of the score serves both
+    elements = None
     if durationScale != False:
-        scaleDurations(score, durationScale, inPlace = True)
+        elements = score.recurse()
+        _scaleElementDurations(elements, durationScale, True)
+        for p in score.parts:
+            p.makeBeams(inPlace=True)
     if barlineStyle != False:
         setBarlineStyle(score, barlineStyle, inPlace = True)
     if tieTransfer != False:
-        transferTies(score, inPlace = True)
+        if elements is None:
+            elements = score.recurse()
+        _transferTiesOnElements(elements)
     
     return score
 
+def _countStrettos(generics):
+    '''
+    Given a list of directed generic intervals between successive notes, returns a dictionary
+    of how many of them each stretto type in allowableStrettoIntervals permits.
+    
+    >>> counts = medren._countStrettos([3, 3, 5, 5, -2])
+    >>> counts[8], counts[-8], counts[5], counts[-5], counts[4], counts[-4]
+    (3, 3, 4, 0, 1, 4)
+    '''
+    strettoKeys = dict.fromkeys(_strettoTypes, 0)
+    lastInterval = None
+    for thisGeneric in generics:
+        for strettoType, repeatAllowed in _strettoTypesByInterval.get(thisGeneric, ()):
+            if thisGeneric != lastInterval or repeatAllowed is True:
+                strettoKeys[strettoType] += 1
+        lastInterval = thisGeneric
+    return strettoKeys
+
 def cummingSchubertStrettoFuga(score):
     '''
     evaluates how well a given score works as a Stretto fuga would work at different intervals
     '''
-    lastInterval = None
     sn = score.flat.notes
-    strettoKeys = {8: 0, -8: 0, 5: 0, -5: 0, 4: 0, -4: 0}
-    
-    for i in range(len(sn)-1):
-        thisInt = interval.notesToInterval(sn[i], sn[i+1])
-        thisGeneric = thisInt.generic.directed
-        for strettoType in [8, -8, 5, -5, 4, -4]:
-            strettoAllowed = [x[0] for x in allowableStrettoIntervals[strettoType]] #inefficent but who cares
-            repeatAllowed = [x[1] for x in allowableStrettoIntervals[strettoType]]
-            for j in range(len(strettoAllowed)):
-                thisStrettoAllowed = strettoAllowed[j]
-                if thisGeneric == thisStrettoAllowed:
-                    if thisGeneric != lastInterval:
-                        strettoKeys[strettoType] += 1
-                    elif thisGeneric == lastInterval and repeatAllowed[j] is True:
-                        strettoKeys[strettoType] += 1
-            
-        lastInterval = thisGeneric
+    
+    # only the directed generic interval between neighbors matters, so staff positions are enough
+    diatonicNoteNums = [n.diatonicNoteNum for n in sn]
+    staffDistanceToInterval = interval.convertStaffDistanceToInterval
+    generics = [staffDistanceToInterval(second - first) for first, second in zip(diatonicNoteNums, diatonicNoteNums[1:])]
+    strettoKeys = _countStrettos(generics)
     if score.title:
-        print score.title
+        print(score.title)
     
-    print "intv.\tcount\tpercent"
+    print("intv.\tcount\tpercent")
     for l in sorted(strettoKeys.keys()):
-        print ("%2d\t%3d\t%2d%%" % (l, strettoKeys[l], strettoKeys[l]*100/len(sn)-1))
-    print "\n"
+        print("%2d\t%3d\t%2d%%" % (l, strettoKeys[l], strettoKeys[l]*100/len(sn)-1))
+    print("\n")
         
 class MedRenException(exceptions21.Music21Exception):
     pass
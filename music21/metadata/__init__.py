@@ -167,6 +167,11 @@ class Metadata(base.Music21Object):
     for key, value in workIdAbbreviationDict.items():
         workIdLookupDict[value.lower()] = key
 
+    # work id or abbreviation: work id, for attribute access
+    workIdAttributeDict = dict(workIdAbbreviationDict)
+    for value in workIdAbbreviationDict.values():
+        workIdAttributeDict[value] = value
+
     ### INITIALIZER ###
 
     def __init__(self, *args, **keywords):
@@ -186,16 +191,13 @@ class Metadata(base.Music21Object):
         self._copyright = None
 
         # a dictionary of Text elements, where keys are work id strings
-        # all are loaded with None by default
+        # only work ids that have been given are stored; a full name
+        # takes precedence over its abbreviation
         self._workIds = {}
-        for abbreviation, workId in self.workIdAbbreviationDict.iteritems():
-            #abbreviation = workIdToAbbreviation(id)
-            if workId in keywords:
-                self._workIds[workId] = Text(keywords[workId])
-            elif abbreviation in keywords:
-                self._workIds[workId] = Text(keywords[abbreviation])
-            else:
-                self._workIds[workId] = None
+        for key in keywords:
+            workId = self.workIdAttributeDict.get(key)
+            if workId is not None and (key == workId or workId not in keywords):
+                self._workIds[workId] = Text(keywords[key])
 
         # search for any keywords that match attributes
         # these are for direct Contributor access, must have defined
@@ -211,19 +213,10 @@ class Metadata(base.Music21Object):
         Utility attribute access for attributes that do not yet have property
         definitions.
         '''
-        match = None
-        for abbreviation, workId in self.workIdAbbreviationDict.iteritems():
-        #for id in WORK_IDS:
-            #abbreviation = workIdToAbbreviation(id)
-            if name == workId:
-                match = workId
-                break
-            elif name == abbreviation:
-                match = workId
-                break
+        match = self.workIdAttributeDict.get(name)
         if match is None:
             raise AttributeError('object has no attribute: %s' % name)
-        result = self._workIds[match]
+        result = self._workIds.get(match)
         # always return string representation for now
         return str(result)
 
@@ -500,21 +493,14 @@ class Metadata(base.Music21Object):
 
         '''
         idStr = idStr.lower()
-        match = False
-        for abbreviation, workId in self.workIdAbbreviationDict.iteritems():
-        #for id in WORK_IDS:
-            #abbreviation = workIdToAbbreviation(id)
-            if workId.lower() == idStr:
-                self._workIds[workId] = Text(value)
-                match = True
-                break
-            elif abbreviation == idStr:
-                self._workIds[workId] = Text(value)
-                match = True
-                break
-        if not match:
+        if idStr in self.workIdLookupDict:
+            workId = self.workIdAbbreviationDict[self.workIdLookupDict[idStr]]
+        elif idStr in self.workIdAbbreviationDict:
+            workId = self.workIdAbbreviationDict[idStr]
+        else:
             raise exceptions21.MetadataException(
                 'no work id available with id: %s' % idStr)
+        self._workIds[workId] = Text(value)
 
     @staticmethod
     def workIdToAbbreviation(value):
@@ -525,6 +511,8 @@ class Metadata(base.Music21Object):
             >>> from music21 import metadata
             >>> metadata.Metadata.workIdToAbbreviation('localeOfComposition')
             'opc'
+            >>> metadata.Metadata.workIdToAbbreviation('LocaleOfComposition')
+            'opc'
 
         ::
 
@@ -540,13 +528,12 @@ class Metadata(base.Music21Object):
         except KeyError:
             pass
 
-        # slow approach
-        for workId in Metadata.workIdAbbreviationDict.keys():
-            if value.lower() == \
-                Metadata.workIdAbbreviationDict[workId].lower():
-                return workId
-        raise exceptions21.MetadataException(
-            'no such work id: %s' % value)
+        # then without regard to case
+        try:
+            return Metadata.workIdLookupDict[value.lower()]
+        except KeyError:
+            raise exceptions21.MetadataException(
+                'no such work id: %s' % value)
 
     ### PUBLIC PROPERTIES ###
 
@@ -565,7 +552,7 @@ class Metadata(base.Music21Object):
                 'Heroic Symphony'
 
             '''
-            result = self._workIds['alternativeTitle']
+            result = self._workIds.get('alternativeTitle')
             if result is not None:
                 return str(result)
 
@@ -671,7 +658,7 @@ class Metadata(base.Music21Object):
             r'''
             Get or set the locale of composition, or origin, of the work.
             '''
-            result = self._workIds['localeOfComposition']
+            result = self._workIds.get('localeOfComposition')
             if result is not None:
                 return str(result)
 
@@ -691,7 +678,7 @@ class Metadata(base.Music21Object):
             Chorales, since they are technically movements of larger cantatas.
 
             '''
-            result = self._workIds['movementName']
+            result = self._workIds.get('movementName')
             if result is not None:
                 return str(result)
 
@@ -706,7 +693,7 @@ class Metadata(base.Music21Object):
             r'''
             Get or set the movement number.
             '''
-            result = self._workIds['movementNumber']
+            result = self._workIds.get('movementNumber')
             if result is not None:
                 return str(result)
 
@@ -723,7 +710,7 @@ class Metadata(base.Music21Object):
 
             TODO: Explain what this means...
             '''
-            result = self._workIds['number']
+            result = self._workIds.get('number')
             if result is not None:
                 return str(result)
 
@@ -738,7 +725,7 @@ class Metadata(base.Music21Object):
             r'''
             Get or set the opus number.
             '''
-            result = self._workIds['opusNumber']
+            result = self._workIds.get('opusNumber')
             if result is not None:
                 return str(result)
 
@@ -793,13 +780,12 @@ class Metadata(base.Music21Object):
                 'alternativeTitle',
                 'movementName',
                 )
-            result = None
             for key in searchId:
-                result = self._workIds[key]
+                result = self._workIds.get(key)
                 if result is not None:  # get first matched
                     # get a string from this Text object
                     # get with normalized articles
-                    return self._workIds[key].getNormalizedArticle()
+                    return result.getNormalizedArticle()
 
         def fset(self, value):
             self._workIds['title'] = Text(value)
@@ -13,6 +13,7 @@
 
 import datetime
 import os
+import re
 import unittest
 
 from music21 import common
@@ -29,6 +30,14 @@ environLocal = environment.Environment(os.path.basename(__file__))
 #------------------------------------------------------------------------------
 
 
+# the same date strings recur throughout a corpus, so their parses are kept
+_strippedDateErrors = {}  # string: (string without error symbol, error)
+_parsedDateStrings = {}  # date string: (values, errors), as loadStr reads it
+# both are emptied when they fill, as they live as long as the process
+_dateStringCacheLimit = 4096
+_dateSeparators = re.compile('[/:]')  # `year/month/day/hour:minute:second`
+
+
 class Date(object):
     r'''
     A single date value, specified by year, month, day, hour, minute, and
@@ -72,6 +81,12 @@ class Date(object):
 
     uncertainSymbols = ['?', 'z']
 
+    # shared by all dates, so kept on the class rather than on each instance
+    attrNames = ('year', 'month', 'day', 'hour', 'minute', 'second')
+
+    # format strings for data components
+    attrStrFormat = ('%04.i', '%02.i', '%02.i', '%02.i', '%02.i', '%006.2f')
+
     ### INITIALIZER ###
 
     def __init__(self, *args, **keywords):
@@ -89,21 +104,18 @@ class Date(object):
         self.hourError = None
         self.minuteError = None
         self.secondError = None
-        self.attrNames = ['year', 'month', 'day', 'hour', 'minute', 'second']
-        # format strings for data components
-        self.attrStrFormat = [
-            '%04.i', '%02.i', '%02.i', '%02.i', '%02.i', '%006.2f']
-        # set any keywords supplied
-        for attr in self.attrNames:
-            if attr in keywords:
-                value, error = self._stripError(keywords[attr])
-                setattr(self, attr, value)
-                if error is not None:
-                    setattr(self, attr + 'Error', error)
-        for attr in self.attrNames:
-            attr = attr + 'Error'
-            if attr in keywords:
-                setattr(self, attr, keywords[attr])
+        # set any keywords supplied; an explicit error overrides one
+        # given with the value
+        if keywords:
+            for attr in self.attrNames:
+                if attr in keywords:
+                    value, error = self._stripError(keywords[attr])
+                    setattr(self, attr, value)
+                    if error is not None:
+                        setattr(self, attr + 'Error', error)
+                errorAttr = attr + 'Error'
+                if errorAttr in keywords:
+                    setattr(self, errorAttr, keywords[errorAttr])
 
     ### SPECIAL METHODS ###
 
@@ -119,31 +131,52 @@ class Date(object):
             >>> str(d)
             '3030?/12~/04?'
 
+        Times are included when any of them is set:
+
+        ::
+
+            >>> d = metadata.Date(year=1834, month=12, day=4, hour=4, minute=50)
+            >>> str(d)
+            '1834/12/04/04/50/--'
+
         '''
         # datetime.strftime("%Y.%m.%d")
         # cannot use this, as it does not support dates lower than 1900!
-        msg = []
+        values = (self.year, self.month, self.day,
+            self.hour, self.minute, self.second)
+        errors = (self.yearError, self.monthError, self.dayError,
+            self.hourError, self.minuteError, self.secondError)
         if self.hour is None and self.minute is None and self.second is None:
             breakIndex = 3  # index
-        for i in range(len(self.attrNames)):
-            if i >= breakIndex:
-                break
-            attr = self.attrNames[i]
-            value = getattr(self, attr)
-            error = getattr(self, attr + 'Error')
-            if value is None:
-                msg.append('--')
-            else:
-                fmt = self.attrStrFormat[i]
-                if error is not None:
-                    sub = fmt % value + Date.errorToSymbol(error)
-                else:
-                    sub = fmt % value
-                msg.append(sub)
-        return '/'.join(msg)
+        else:
+            breakIndex = len(values)
+        return '/'.join([self._fieldToStr(values[i], errors[i], i)
+            for i in range(breakIndex)])
 
     ### PRIVATE METHODS ###
 
+    def _fieldToStr(self, value, error, index):
+        r'''
+        Format one date component, given its value, error, and position in
+        :attr:`attrNames`, for :meth:`__str__`.
+
+        ::
+
+            >>> from music21 import metadata
+            >>> d = metadata.Date()
+            >>> d._fieldToStr(12, 'approximate', 1)
+            '12~'
+            >>> d._fieldToStr(None, None, 2)
+            '--'
+
+        '''
+        if value is None:
+            return '--'
+        sub = self.attrStrFormat[index] % value
+        if error is not None:
+            sub += Date.errorToSymbol(error)
+        return sub
+
     def _stripError(self, value):
         r'''
         Strip error symbols from a numerical value. Return cleaned source and
@@ -166,25 +199,61 @@ class Date(object):
             >>> d._stripError('234.43')
             ('234.43', None)
 
+        ::
+
+            >>> d._stripError('12?~')
+            ('12~', 'uncertain')
+
         '''
         if common.isNum(value):  # if a number, let pass
             return value, None
+        elif value in _strippedDateErrors:
+            return _strippedDateErrors[value]
         else:
             dateStr = value
-        sym = self.approximateSymbols + self.uncertainSymbols
+        # substring tests run in C; the earliest symbol present is the one used
+        present = [(dateStr.index(char), char) for char in
+            self.approximateSymbols + self.uncertainSymbols if char in dateStr]
         found = None
-        for char in dateStr:
-            if char in sym:
-                found = char
-                break
+        if present:
+            found = min(present)[1]
         if found is None:
-            return dateStr, None
+            result = dateStr, None
         elif found in self.approximateSymbols:
             dateStr = dateStr.replace(found, '')
-            return dateStr, 'approximate'
+            result = dateStr, 'approximate'
         elif found in self.uncertainSymbols:
             dateStr = dateStr.replace(found, '')
-            return dateStr, 'uncertain'
+            result = dateStr, 'uncertain'
+        if len(_strippedDateErrors) >= _dateStringCacheLimit:
+            _strippedDateErrors.clear()
+        _strippedDateErrors[value] = result
+        return result
+
+    def _parseStr(self, dateStr):
+        r'''
+        Split a date string into a tuple of values and a tuple of their
+        errors, for :meth:`~music21.metadata.Date.loadStr`.
+
+        ::
+
+            >>> from music21 import metadata
+            >>> d = metadata.Date()
+            >>> d._parseStr('1834/12~/4')
+            ((1834, 12, 4), (None, 'approximate', None))
+
+        '''
+        post = []
+        postError = []
+        dateStr = dateStr.replace(' ', '')
+        for chunk in _dateSeparators.split(dateStr):
+            value, error = self._stripError(chunk)
+            post.append(value)
+            postError.append(error)
+        # as error is stripped, we can now convert to numbers
+        if len(post) > 0 and post[0] != '':
+            post = [int(x) for x in post]
+        return tuple(post), tuple(postError)
 
     ### PUBLIC METHODS ###
 
@@ -315,23 +384,18 @@ class Date(object):
             (50, 32)
 
         '''
-        post = []
-        postError = []
-        dateStr = dateStr.replace(':', '/')
-        dateStr = dateStr.replace(' ', '')
-        for chunk in dateStr.split('/'):
-            value, error = self._stripError(chunk)
-            post.append(value)
-            postError.append(error)
-        # as error is stripped, we can now convert to numbers
-        if len(post) > 0 and post[0] != '':
-            post = [int(x) for x in post]
-        # assume in order in post list
-        for i in range(len(self.attrNames)):
-            if len(post) > i:  # only assign for those specified
-                setattr(self, self.attrNames[i], post[i])
-                if postError[i] is not None:
-                    setattr(self, self.attrNames[i] + 'Error', postError[i])
+        if dateStr in _parsedDateStrings:
+            post, postError = _parsedDateStrings[dateStr]
+        else:
+            post, postError = self._parseStr(dateStr)
+            if len(_parsedDateStrings) >= _dateStringCacheLimit:
+                _parsedDateStrings.clear()
+            _parsedDateStrings[dateStr] = post, postError
+        # assume in order in post list; zip only assigns those specified
+        for attr, value, error in zip(self.attrNames, post, postError):
+            setattr(self, attr, value)
+            if error is not None:
+                setattr(self, attr + 'Error', error)
 
     ### PUBLIC PROPERTIES ###
 
@@ -475,6 +539,8 @@ class DateSingle(object):
 
     isSingle = True
 
+    relevanceValues = frozenset(('certain', 'approximate', 'uncertain'))
+
     ### INITIALIZER ###
 
     def __init__(self, data='', relevance='certain'):
@@ -540,7 +606,7 @@ class DateSingle(object):
             return self._relevance
 
         def fset(self, value):
-            if value in ['certain', 'approximate', 'uncertain']:
+            if value in self.relevanceValues:
                 self._relevance = value
                 self._dataError = []
                 # only here is dataError the same as relevance
@@ -579,6 +645,8 @@ class DateRelative(DateSingle):
 
     isSingle = True
 
+    relevanceValues = frozenset(('prior', 'after'))
+
     ### INITIALIZER ###
 
     def __init__(self, data='', relevance='after'):
@@ -592,7 +660,7 @@ class DateRelative(DateSingle):
             return self._relevance
 
         def fset(self, value):
-            if value not in ['prior', 'after']:
+            if value not in self.relevanceValues:
                 raise exceptions21.MetadataException(
                     'Relevance value is not supported by this object: '
                     '{0!r}'.format(value))
@@ -627,6 +695,8 @@ class DateBetween(DateSingle):
 
     isSingle = False
 
+    relevanceValues = frozenset(('between',))
+
     ### INITIALIZER ###
 
     def __init__(self, data=[], relevance='between'):
@@ -635,10 +705,7 @@ class DateBetween(DateSingle):
     ### SPECIAL METHODS ###
 
     def __str__(self):
-        msg = []
-        for d in self._data:
-            msg.append(str(d))
-        return ' to '.join(msg)
+        return ' to '.join(map(str, self._data))
 
     ### PRIVATE METHODS ###
 
@@ -663,7 +730,7 @@ class DateBetween(DateSingle):
             return self._relevance
 
         def fset(self, value):
-            if value not in ['between']:
+            if value not in self.relevanceValues:
                 raise exceptions21.MetadataException(
                     'Relevance value is not supported by this object: '
                     '{0!r}'.format(value))
@@ -705,6 +772,8 @@ class DateSelection(DateSingle):
 
     isSingle = False
 
+    relevanceValues = frozenset(('or',))
+
     ### INITIALIZER ###
 
     def __init__(self, data='', relevance='or'):
@@ -713,10 +782,7 @@ class DateSelection(DateSingle):
     ### SPECIAL METHODS ###
 
     def __str__(self):
-        msg = []
-        for d in self._data:
-            msg.append(str(d))
-        return ' or '.join(msg)
+        return ' or '.join(map(str, self._data))
 
     ### PRIVATE METHODS ###
 
@@ -741,7 +807,7 @@ class DateSelection(DateSingle):
             return self._relevance
 
         def fset(self, value):
-            if value not in ['or']:
+            if value not in self.relevanceValues:
                 raise exceptions21.MetadataException(
                     'Relevance value is not supported by this object: '
                     '{0!r}'.format(value))
@@ -777,17 +843,20 @@ class Text(object):
             self._language = data._language
         else:
             self._data = data
-            self._language = language
+            self.language = language
 
     ### SPECIAL METHODS ###
 
     def __str__(self):
         # print type(self._data)
-        if isinstance(self._data, unicode):
+        data = self._data
+        if data.__class__ is str:  # the usual case needs no conversion
+            return data
+        elif isinstance(data, unicode):
             # not sure if this should be wrapped in in str() call
-            return self._data.encode('utf-8')
+            return data.encode('utf-8')
         else:
-            return str(self._data)
+            return str(data)
 
     ### PUBLIC PROPERTIES ###
 
@@ -805,10 +874,20 @@ class Text(object):
                 >>> t.language
                 'en'
 
+            Language codes are interned, as the same few are shared by
+            many texts:
+
+            ::
+
+                >>> t.language is metadata.Text('other text', 'en').language
+                True
+
             '''
             return self._language
 
         def fset(self, value):
+            if value.__class__ is str:
+                value = intern(value)
             self._language = value
 
         return property(**locals())
@@ -901,6 +980,10 @@ class Contributor(object):
 
     roleNames = roleAbbreviationsDict.values()
 
+    # lower-case role name: abbreviation
+    roleLookupDict = dict((name.lower(), abbreviation)
+        for abbreviation, name in roleAbbreviationsDict.items())
+
     ### INITIALIZER ###
 
     def __init__(self, *args, **keywords):
@@ -960,13 +1043,18 @@ class Contributor(object):
             >>> a.age().days / 365
             56
 
+        Without both a birth and a death date, the age is None:
+
+        ::
+
+            >>> metadata.Contributor(birth='1770/12/17').age() is None
+            True
+
         '''
-        if self._dateRange[0] is not None and self._dateRange[1] is not None:
-            b = self._dateRange[0].datetime
-            d = self._dateRange[1].datetime
-            return d - b
-        else:
+        birth, death = self._dateRange
+        if birth is None or death is None:
             return None
+        return death.datetime - birth.datetime
 
     ### PUBLIC PROPERTIES ###
 
@@ -991,6 +1079,12 @@ class Contributor(object):
                 >>> td.names
                 ['Chopin, Fryderyk', 'Chopin, Frederick']
 
+            ::
+
+                >>> td.name = 'Chopin, Frederic'
+                >>> td.name
+                'Chopin, Frederic'
+
             '''
             # return first name
             return str(self._names[0])
@@ -1018,11 +1112,7 @@ class Contributor(object):
             ['Chopin, Fryderyk', 'Chopin, Frederick']
 
         '''
-        # return first name
-        msg = []
-        for n in self._names:
-            msg.append(str(n))
-        return msg
+        return [str(n) for n in self._names]
 
     @apply
     def role():  # @NoSelf
@@ -1049,9 +1139,9 @@ class Contributor(object):
             return self._role
 
         def fset(self, value):
-            if value is None or value in self.roleAbbreviationsDict.values():
+            if value is None or value in self.roleNames:
                 self._role = value
-            elif value in self.roleAbbreviationsDict.keys():
+            elif value in self.roleAbbreviationsDict:
                 self._role = self.roleAbbreviationsDict[value]
             else:
                 raise exceptions21.MetadataException(
@@ -1095,12 +1185,10 @@ class Contributor(object):
             'com'
 
         '''
-        # note: probably not the fastest way to do this
-        for role_id in Contributor.roleAbbreviationsDict:
-            if roleName.lower() == \
-                Contributor.roleAbbreviationsDict[role_id].lower():
-                return role_id
-        raise exceptions21.MetadataException('No such role: %s' % roleName)
+        try:
+            return Contributor.roleLookupDict[roleName.lower()]
+        except KeyError:
+            raise exceptions21.MetadataException('No such role: %s' % roleName)
 
 #------------------------------------------------------------------------------
 
@@ -16,7 +16,7 @@ as well as component objects for defining nested metrical structures,
 '''
 
 import unittest
-import re, copy
+import copy
 #import fractions # available in 2.6 and greater
 
 from music21 import base
@@ -44,9 +44,14 @@ _meterSequenceAccentArchetypes = {}
 #_meterSequenceBeatArchetypes = {}
 #_meterSequenceBeamArchetypes = {}
 # store meter sequence division options, once created, in a module
-# level dictionary
+# level dictionary keyed by (numerator, denominator); callers must not
+# alter the stored lists
 _meterSequenceDivisionOptions = {}
 
+# store parsed slash notation strings, as the same few (such as '1/8')
+# are parsed for nearly every MeterTerminal created
+_slashToFractionCache = {}
+
 def slashToFraction(value):
     '''
 
@@ -56,23 +61,28 @@ def slashToFraction(value):
     (7, 32, None)
     >>> meter.slashToFraction('slow 6/8')
     (6, 8, 'slow')
+    >>> meter.slashToFraction('/8') is None
+    True
     '''
+    if value in _slashToFractionCache:
+        return _slashToFractionCache[value]
     tempoIndication = None
     # split by numbers, include slash
     valueNumbers, valueChars = common.getNumFromStr(value,
                             numbers='0123456789/')
-    valueNumbers = valueNumbers.strip() # remove whitespace
-    valueChars = valueChars.strip() # remove whitespace
-    if 'slow' in valueChars.lower():
+    valueChars = valueChars.lower()
+    if 'slow' in valueChars:
         tempoIndication = 'slow'
-    elif 'fast' in valueChars.lower():
+    elif 'fast' in valueChars:
         tempoIndication = 'fast'
 
-    matches = re.match("(\d+)\/(\d+)", valueNumbers)
-    if matches is not None:
-        n = int(matches.group(1))
-        d = int(matches.group(2))
-        return n, d, tempoIndication
+    # valueNumbers holds only digits and slashes; the fraction is the
+    # first two groups of digits, which must both be present
+    parts = valueNumbers.split('/', 2)
+    if len(parts) > 1 and parts[0] != '' and parts[1] != '':
+        post = int(parts[0]), int(parts[1]), tempoIndication
+        _slashToFractionCache[value] = post
+        return post
     else:
         environLocal.printDebug(['slashToFraction() cannot find two part fraction', value])
         return None
@@ -176,35 +186,19 @@ def fractionToSlashMixed(fList):
 
     >>> meter.fractionToSlashMixed([(3, 8), (2, 8), (5, 8), (3, 4), (2, 16), (1, 16), (4, 16)])
     [('3+2+5', 8), ('3', 4), ('2+1+4', 16)]
+    >>> meter.fractionToSlashMixed([(3, 8), (3, 4), (2, 8)])
+    [('3', 8), ('3', 4), ('2', 8)]
     '''
     pre = []
-    for i in range(len(fList)):
-        n, d = fList[i]
-        # look at previous fration and determin if denominator is the same
-
-        match = None
-        search = range(0,len(pre))
-        search.reverse() # go backwards
-        for j in search:
-            if pre[j][1] == d:
-                match = j # index to add numerator
-                break
-            else:
-                break # if not found in one less
-
-        if match == None:
+    for n, d in fList:
+        # only the previous fraction is compacted with this one, if the
+        # denominator is the same
+        if pre and pre[-1][1] == d:
+            pre[-1][0].append(n)
+        else:
             pre.append([[n], d])
-        else: # appnd nuemrator
-            pre[match][0].append(n)
     # create string representation
-    post = []
-    for part in pre:
-        n = [str(x) for x in part[0]]
-        n = '+'.join(n)
-        d = part[1]
-        post.append((n, d))
-
-    return post
+    return [('+'.join([str(x) for x in nList]), d) for nList, d in pre]
 
 
 def fractionSum(fList):
@@ -221,34 +215,14 @@ def fractionSum(fList):
     (43, 221)
 
     '''
-    nList = []
-    dList = []
-    nListUnique = []
-    dListUnique = []
-
-    for n,d in fList:
-        nList.append(n)
-        if n not in nListUnique:
-            nListUnique.append(n)
-        dList.append(d)
-        if d not in dListUnique:
-            dListUnique.append(d)
-
-    if len(dListUnique) == 1:
-        n = sum(nList)
-        d = dList[0]
-        return (n, d)
+    dUnique = set([d for unused_n, d in fList])
+
+    if len(dUnique) == 1:
+        return (sum([n for n, unused_d in fList]), fList[0][1])
     else: # there might be a better way to do this
-        d = 1
-        d = common.lcm(dListUnique)
-        # after finding d, multuple each numerator
-        nShift = []
-        for i in range(len(nList)):
-            nSrc = nList[i]
-            dSrc = dList[i]
-            scalar = d / dSrc
-            nShift.append(nSrc*scalar)
-        return (sum(nShift), d)
+        d = common.lcm(list(dUnique))
+        # after finding d, multiply each numerator
+        return (sum([n * (d // dSrc) for n, dSrc in fList]), d)
 
 
 def proportionToFraction(value):
@@ -1311,19 +1285,20 @@ class MeterSequence(MeterTerminal):
 
 
     def _getOptions(self):
-        # all-string python dictionaries are optimized; use string key
-        n = int(self.numerator)
-        d = int(self.denominator)
-        tsStr = '%s/%s' % (n, d)
+        # key by the ratio itself, rather than formatting a string on
+        # every call; equal int and float values hash alike
+        ratio = (self.numerator, self.denominator)
         try:
             # return a stored, cached value
-            return _meterSequenceDivisionOptions[tsStr]
+            return _meterSequenceDivisionOptions[ratio]
         except KeyError:
+            n = int(self.numerator)
+            d = int(self.denominator)
             opts = []
             opts += self._divisionOptionsAlgo(n, d)
             opts += self._divisionOptionsPreset(n, d)
             # store for access later
-            _meterSequenceDivisionOptions[tsStr] = opts
+            _meterSequenceDivisionOptions[ratio] = opts
         return opts
 
 
@@ -24,6 +24,7 @@ from music21 import base
 from music21 import clef
 from music21 import common
 from music21 import duration
+from music21 import environment
 from music21 import exceptions21
 from music21 import meter
 from music21 import note
@@ -33,6 +34,9 @@ from music21 import tie
 from music21 import tinyNotation
 import unittest
 
+_MOD = 'trecento.notation.py'
+environLocal = environment.Environment(_MOD)
+
 _validDivisiones = {
     (None, None): 0,
     ('quaternaria', '.q.'): 4,
@@ -43,6 +47,18 @@ _validDivisiones = {
     ('duodenaria', '.d.'): 12,
     }
 
+_typeStrengths = {'semibrevis': 1.0, 'minima': 0.5, 'semiminima': 0.25}
+
+_divisioneTimeStrings = {
+    None: None,
+    '.q.': '2/4',
+    '.i.': '6/8',
+    '.p.': '3/4',
+    '.n.': '9/8',
+    '.o.': '2/4',
+    '.d.': '3/4',
+    }
+
 
 #------------------------------------------------------------------------------
 
@@ -498,20 +514,8 @@ class Divisione(meter.TimeSignature):
                 self.standardSymbol = d[1]
                 self._minimaPerBrevis = _validDivisiones[d]
 
-        if self.standardSymbol == None:
-            self.timeString = None
-        elif self.standardSymbol == '.q.':
-            self.timeString = '2/4'
-        elif self.standardSymbol == '.i.':
-            self.timeString = '6/8'
-        elif self.standardSymbol == '.p.':
-            self.timeString = '3/4'
-        elif self.standardSymbol == '.n.':
-            self.timeString = '9/8'
-        elif self.standardSymbol == '.o.':
-            self.timeString = '2/4'
-        elif self.standardSymbol == '.d.':
-            self.timeString = '3/4'
+        if self.standardSymbol in _divisioneTimeStrings:
+            self.timeString = _divisioneTimeStrings[self.standardSymbol]
         else:
             raise TrecentoNotationException('cannot make out the divisione from name or symbol %s' % nameOrSymbol)
 
@@ -582,9 +586,6 @@ def convertTrecentoStream(inpStream, inpDiv = None):
     >>> SePerDureca.append(trecento.notation.TinyTrecentoNotationStream(lowerString))
 
     >>> SePerDurecaConverted = trecento.notation.convertTrecentoStream(SePerDureca)
-    <BLANKLINE>
-    Converting stream ... 
-    ...
 
     >>> #_DOCS_HIDE SePerDurecaConverted.show()
 
@@ -609,27 +610,26 @@ def convertTrecentoStream(inpStream, inpDiv = None):
         convertedStream = stream.Stream()
 
     measuredStream = medren.breakMensuralStreamIntoBrevisLengths(inpStream, inpDiv)
-    print ''
 
     for e in measuredStream:
 
-        if ('Metadata' in e.classes) or  ('TextBox' in e.classes): #Formatting
-            convertedStream.append(e)
-
-        elif 'MensuralClef' in e.classes:
+        if isinstance(e, medren.MensuralClef):
             pass
 
-        elif 'Divisione' in e.classes:
+        elif isinstance(e, Divisione):
             div = e
 
+        elif ('Metadata' in e.classes) or  ('TextBox' in e.classes): #Formatting
+            convertedStream.append(e)
+
         elif e.isMeasure:
-            print '    Converting measure %s' % e.number
+            environLocal.printDebug(['Converting measure', e.number])
             measureList = convertBrevisLength(e, convertedStream, inpDiv = div, measureNumOffset = offset)
             for m in measureList:
                 convertedStream.append(m)
 
         elif e.isStream:
-            print 'Converting stream %s' % e
+            environLocal.printDebug(['Converting stream', e])
             convertedPart = convertTrecentoStream(e, inpDiv = div)
             convertedStream.insert(0, convertedPart)
 
@@ -648,6 +648,8 @@ def convertBrevisLength(brevisLength, convertedStream, inpDiv = None, measureNum
 
     This acts as a helper method to improve the efficiency of :meth:`music21.trecento.notation.convertTrecentoStream`.
     '''
+    from music21 import medren
+
     div = inpDiv
     m = stream.Measure(number = brevisLength.number + measureNumOffset)
     rem = None
@@ -660,7 +662,7 @@ def convertBrevisLength(brevisLength, convertedStream, inpDiv = None, measureNum
     lenList = tempTBL.getKnownLengths()
 
     for item in mList:
-        if 'Divisione' in item.classes:
+        if isinstance(item, Divisione):
             if div is None:
                 div = item
             else:
@@ -707,9 +709,9 @@ def convertBrevisLength(brevisLength, convertedStream, inpDiv = None, measureNum
 
     else:
         for i in range(len(mList)):
-            if 'MensuralRest' in mList[i].classes:
+            if isinstance(mList[i], medren.MensuralRest):
                 n = note.Rest()
-            elif 'MensuralNote' in mList[i].classes:
+            elif isinstance(mList[i], medren.MensuralNote):
                 n = note.Note(mList[i].pitch)
 
             dur = lenList[i]*mDur
@@ -787,15 +789,81 @@ class TranslateBrevisLength(object):
 
         self.minimaRemaining = self.div.minimaPerBrevis
         self.minRem_tracker = pDS
+        self._pDS = pDS
         self.doubleNum = 0
 
+        self._breveStrengthCache = {}
+        self._brevisLengthDescriptor = None
+
     def getKnownLengths(self):
+        '''
+        Returns the length in minima of each object in the brevis length.
+
+        Brevis lengths with the same divisione and the same sequence of note
+        types, stems, and flags always translate the same way, so the result
+        is looked up by that shape (see :meth:`TranslateBrevisLength.getShapeKey`)
+        and only translated the first time it is seen.  At most
+        _knownLengthsCacheLimit shapes are kept; the store is emptied when it fills.
+
+        >>> from music21 import medren, trecento
+
+        >>> div = trecento.notation.Divisione('.i.')
+        >>> BL = [medren.MensuralNote('A', n) for n in ['SB', 'M', 'SB']]
+        >>> trecento.notation.TranslateBrevisLength(div, BL).getKnownLengths()
+        [2.0, 1.0, 3.0]
+
+        >>> BL = [medren.MensuralNote('G', n) for n in ['SB', 'M', 'SB']]
+        >>> TBL = trecento.notation.TranslateBrevisLength(div, BL)
+        >>> TBL.getShapeKey() in trecento.notation._knownLengthsCache
+        True
+        >>> TBL.getKnownLengths()
+        [2.0, 1.0, 3.0]
+        '''
         if 'Divisione' in self.div.classes:
-            self.knownLengthsList = self.translate()
+            shapeKey = self.getShapeKey()
+            if shapeKey in _knownLengthsCache:
+                self.knownLengthsList = _knownLengthsCache[shapeKey][:]
+            else:
+                self.knownLengthsList = self.translate()
+                if self.minRem_tracker: # otherwise translate() returned the objects themselves
+                    if len(_knownLengthsCache) >= _knownLengthsCacheLimit:
+                        _knownLengthsCache.clear()
+                    _knownLengthsCache[shapeKey] = self.knownLengthsList[:]
         else:
             raise TrecentoNotationException('%s not recognized as divisione' % self.div)
         return self.knownLengthsList
 
+    def getShapeKey(self):
+        '''
+        Returns a hashable description of everything about the divisione and
+        self.brevisLength that the translation depends on: the divisione's
+        symbol and minima per brevis (with its type, since int and float
+        counts divide differently), and each object's mensural type,
+        class, stems, and flags.  Pitches are not included.
+
+        >>> from music21 import medren, trecento
+
+        >>> div = trecento.notation.Divisione('.p.')
+        >>> BL = [medren.MensuralNote('A', 'SB'), medren.MensuralRest('SM'), medren.MensuralNote('A', 'SM')]
+        >>> BL[0].setStem('down')
+        >>> trecento.notation.TranslateBrevisLength(div, BL).getShapeKey()
+        ('.p.', <type 'int'>, 6, False, (('semibrevis', 'MensuralNote', ('down',), ()), ('semiminima', 'MensuralRest'), ('semiminima', 'MensuralNote', ('up',), (('up', 'right'),))))
+        '''
+        from music21 import medren
+
+        objShapes = []
+        for obj in self.brevisLength:
+            if isinstance(obj, medren.MensuralNote):
+                objShapes.append((obj.mensuralType, 'MensuralNote',
+                                  tuple(obj.getStems()), tuple(sorted(obj.getFlags().items()))))
+            elif isinstance(obj, medren.MensuralRest):
+                objShapes.append((obj.mensuralType, 'MensuralRest'))
+            else:
+                objShapes.append((obj.mensuralType, obj.classes[0]))
+        minimaPerBrevis = self.div.minimaPerBrevis
+        return (self.div.standardSymbol, minimaPerBrevis.__class__, minimaPerBrevis,
+                self._pDS, tuple(objShapes))
+
     def getBreveStrength(self, lengths):
         '''
         :meth:`TranslateBrevisLength._evaluateBL` takes divisione, a brevis
@@ -804,6 +872,8 @@ class TranslateBrevisLength(object):
 
         This method returns the *strength* of the list based on those lengths.
         A *strong* list has longer notes on its stronger beats. Only valid for Trecento notation.
+        Strengths are cached by lengths until the notes are reclassified with
+        :meth:`TranslateBrevisLength.classifyUnknownNotesByType`.
 
         In this example, we test two possible interpretations for the same measure
         and see that the second is more logical.  Note that the strength itself is meaningless
@@ -826,9 +896,12 @@ class TranslateBrevisLength(object):
             2.8333...
 
         '''
+        cacheKey = tuple(lengths)
+        if cacheKey in self._breveStrengthCache:
+            return self._breveStrengthCache[cacheKey]
+
         div = self.div
-        BL = self.brevisLength
-        typeStrength = {'semibrevis': 1.0, 'minima': 0.5, 'semiminima':0.25}
+        typeStrengths, undownstemmedNotes, unused_maxStrength = self._getBrevisLengthDescriptor()
 
         beatStrength = 0
         strength = 0
@@ -862,7 +935,7 @@ class TranslateBrevisLength(object):
                     beatStrength = 0.25
                 else:
                     beatStrength = 0.125
-            strength += typeStrength[BL[i].mensuralType] * beatStrength
+            strength += typeStrengths[i] * beatStrength
             lengthI = lengths[i]
             if lengthI is None:
                 lengthI = 0.0
@@ -875,13 +948,47 @@ class TranslateBrevisLength(object):
 
         strength -= abs(div.minimaPerBrevis - curBeat)
 
-        from music21 import medren
-        for i, item in enumerate(self.brevisLength):
-            if isinstance(item, medren.MensuralNote) and (not 'down' in item.getStems()) and (lengths[i] > lastSBLen):
+        for i in undownstemmedNotes:
+            if lengths[i] > lastSBLen:
                 strength = 0
 
+        self._breveStrengthCache[cacheKey] = strength
         return strength
 
+    def _getBrevisLengthDescriptor(self):
+        '''
+        Returns the per-note information about self.brevisLength that
+        :meth:`TranslateBrevisLength.getBreveStrength` needs, so that scoring a
+        candidate does not go back to the notes themselves: a list giving the
+        type strength of each note, a list of the indices of the
+        mensural notes without a downstem, and the highest strength any
+        set of lengths could reach (every note on a strongest beat, with
+        the lengths filling the brevis exactly).
+
+        The descriptor is rebuilt after the notes are reclassified with
+        :meth:`TranslateBrevisLength.classifyUnknownNotesByType`.
+
+        >>> from music21 import medren, trecento
+
+        >>> div = trecento.notation.Divisione('.n.')
+        >>> BL = [medren.MensuralNote('A', 'SB'), medren.MensuralNote('A', 'M'), medren.MensuralRest('SM')]
+        >>> BL[0].setStem('down')
+        >>> TBL = trecento.notation.TranslateBrevisLength(div, BL)
+        >>> TBL._getBrevisLengthDescriptor()
+        ([1.0, 0.5, 0.25], [1], 1.75)
+        '''
+        if self._brevisLengthDescriptor is None:
+            from music21 import medren
+
+            typeStrengths = []
+            undownstemmedNotes = []
+            for i, item in enumerate(self.brevisLength):
+                typeStrengths.append(_typeStrengths[item.mensuralType])
+                if isinstance(item, medren.MensuralNote) and (not 'down' in item.getStems()):
+                    undownstemmedNotes.append(i)
+            self._brevisLengthDescriptor = (typeStrengths, undownstemmedNotes, sum(typeStrengths))
+        return self._brevisLengthDescriptor
+
     def determineStrongestMeasureLengths(self, lengths, change_tup, num_tup, diff_tup, lenRem, shrinkable_indices = (), multi = None):
         '''
         Gets all possible length combinations. Returns the lengths combination of the "strongest" list,
@@ -922,6 +1029,10 @@ class TranslateBrevisLength(object):
             multi = len(change_tup) - 1
 
         strength = self.getBreveStrength(lengths)
+        maxStrength = self._getBrevisLengthDescriptor()[2]
+        if strength >= maxStrength:
+            return lengths, lenRem
+
         lengths_changeable = lengths[:]
         lengths_static = lengths[:]
         remain = lenRem
@@ -945,6 +1056,8 @@ class TranslateBrevisLength(object):
                 lengths = lengths_changeable[:]
                 strength = newStrength
                 lenRem_final = remain
+                if strength >= maxStrength: # no other combination can be stronger
+                    break
             lengths_changeable = lengths_static[:]
             remain = lenRem
         return lengths, lenRem_final
@@ -1113,6 +1226,9 @@ class TranslateBrevisLength(object):
         if self.numberOfSemibreves > 0:
             self.hasLastSB = ( retDict['semibrevis'][-1] == (len(self.brevisLength) - 1) )
 
+        self._breveStrengthCache = {} # strengths depend on the classification
+        self._brevisLengthDescriptor = None
+
         return retDict
 
     def translate(self):
@@ -1142,11 +1258,7 @@ class TranslateBrevisLength(object):
 
         if not self.minRem_tracker:
             self.doubleNum += 1
-            newDiv = Divisione(self.div.standardSymbol)
-            newDiv.minimaPerBrevis = 2 * self.div.minimaPerBrevis
             return self.brevisLength
-            tempTBL = TranslateBrevisLength(newDiv, self.brevisLength[:])
-            knownLengthsList = tempTBL.getKnownLengths()
 
         for i in range(len(knownLengthsList)):  # Float errors
             ml = knownLengthsList[i]
@@ -1424,9 +1536,6 @@ class TranslateBrevisLength(object):
 
         knownLengthsList = unchangeableNoteLengthsList[:]
 
-        extend_list = []
-        extend_num = 0
-
         semibrevis_downstem_index = None
         if self.numberOfDownstems > 0: #Only room for one downstem per brevis length
             semibrevis_downstem_index = semibrevis_downstem[0]
@@ -1454,134 +1563,209 @@ class TranslateBrevisLength(object):
 
         else:
             strength = 0
-            knownLengthsList_changeable = knownLengthsList[:]
-            knownLengthsList_static = knownLengthsList[:]
-            minRem_changeable = minRem
-            minRem_static = minRem
-
-            change_tup = ()
-            num_tup = ()
-            diff_tup = ()
-            shrink_tup = ()
-
-            lengths = [(0.5,0.5), (float(2)/3, 0.5), (0.5, float(2)/3), (float(2)/3, float(2)/3)]
-
-            for (left_length, right_length) in lengths:
-                for ind in semiminima_left_flag_list:
-                    knownLengthsList_changeable[ind] = left_length
-                    minRem_changeable -= left_length
-                for ind in semiminima_right_flag_list:
-                    knownLengthsList_changeable[ind] = right_length
-                    minRem_changeable -= right_length
-
-                if left_length == right_length:
+            maxStrength = self._getBrevisLengthDescriptor()[2]
+            candidates = self._translateDivPQCandidates(knownLengthsList[:], minRem, semibrevis_downstem_index)
 
-                    for ind in semiminima_rest_list:
-                        knownLengthsList_changeable[ind] = left_length
-                        minRem_changeable -= left_length
+            for knownLengthsList_changeable, minRem_changeable in candidates:
+                tempStrength = self.getBreveStrength(knownLengthsList_changeable)
+                self.minimaRemaining = minRem_changeable
 
-                    if self.numberOfDownstems > 0:
+                if (tempStrength > strength) and (minRem_changeable > -0.0001): #Technically, >= 0, but rounding error occurs.
+                    knownLengthsList = knownLengthsList_changeable[:]
+                    minRem = minRem_changeable
+                    strength = tempStrength
 
-                        if self.numberOfSemibreves > 0:
-                            knownLengthsList_changeable[semibrevis_list[-1]] = 2.0
-                            minRem_changeable -= 2.0
+                self.minRem_tracker |= (minRem_changeable > -0.0001)
 
-                        knownLengthsList_changeable[semibrevis_downstem_index] = max(2.0, minRem_changeable)
-                        minRem_changeable -= knownLengthsList_changeable[semibrevis_downstem_index]
+                if strength >= maxStrength: # no later candidate can be stronger
+                    break
 
-                    else: #no downstems
+        return knownLengthsList
 
-                        if self.hasLastSB:
-                            knownLengthsList_changeable[semibrevis_list[-1]] = max(2.0, minRem_changeable)
-                            minRem_changeable -= knownLengthsList_changeable[semibrevis_list[-1]]
+    def _translateDivPQCandidates(self, knownLengthsList_static, minRem_static, semibrevis_downstem_index):
+        '''
+        Helper for :meth:`TranslateBrevisLength.translateDivPQ`. Yields, one at a time,
+        the (lengths, minima remaining) candidates for the semiminima length pairs
+        (1/2, 1/2), (2/3, 1/2), (1/2, 2/3), and (2/3, 2/3), so that the search can stop
+        as soon as a candidate cannot be beaten.
+        '''
+        twoThirds = float(2)/3
+
+        yield self._translateDivPQEqual(0.5, knownLengthsList_static[:], minRem_static,
+                                        semibrevis_downstem_index)
+
+        restSides = self._getSemiminimaRestSides()
+        # the two mixed-length candidates share, and add to, one search state
+        searchState = {'extend_list': [],
+                       'extend_num': 0,
+                       'change_tup': (),
+                       'num_tup': (),
+                       'diff_tup': (),
+                       'shrink_tup': (),
+                       }
+
+        yield self._translateDivPQMixed(twoThirds, 0.5, knownLengthsList_static[:], minRem_static,
+                                        semibrevis_downstem_index, restSides, searchState)
+        yield self._translateDivPQMixed(0.5, twoThirds, knownLengthsList_static[:], minRem_static,
+                                        semibrevis_downstem_index, restSides, searchState)
+        yield self._translateDivPQEqual(twoThirds, knownLengthsList_static[:], minRem_static,
+                                        semibrevis_downstem_index)
+
+    def _translateDivPQEqual(self, length, knownLengthsList, minRem, semibrevis_downstem_index):
+        '''
+        Helper for :meth:`TranslateBrevisLength.translateDivPQ`. Gives every
+        semiminima (flagged or rest) the same length, then fills in the final
+        or downstemmed semibrevis.  Returns the updated lengths and the minima remaining.
+        '''
+        unknownLengthsDict = self.unknownLengthsDict
+        semibrevis_list = unknownLengthsDict['semibrevis']
 
-                        elif self.numberOfSemibreves > 0: #semibreves, but no ending SB
-                            knownLengthsList_changeable[semibrevis_list[-1]] = 2.0
-                            minRem_changeable -= 2.0
+        for ind in unknownLengthsDict['semiminima_left_flag'] + unknownLengthsDict['semiminima_right_flag'] + unknownLengthsDict['semiminima_rest']:
+            knownLengthsList[ind] = length
+            minRem -= length
 
-                else: #left_length != right_length
+        if self.numberOfDownstems > 0:
 
-                    master_list = semiminima_left_flag_list + semiminima_right_flag_list + semiminima_rest_list
+            if self.numberOfSemibreves > 0:
+                knownLengthsList[semibrevis_list[-1]] = 2.0
+                minRem -= 2.0
 
-                    for ind in semiminima_rest_list:
+            knownLengthsList[semibrevis_downstem_index] = max(2.0, minRem)
+            minRem -= knownLengthsList[semibrevis_downstem_index]
 
-                        curIndex = int(master_list.index(ind))
+        else: #no downstems
 
-                        # SM Rest is first among all SMs, followed by left flag SM
-                        # or, SM Rest is last among all SMs, preceded by left flag SM
-                        # or, SM Rest is surrounded by left flag SMs.
-                        # Then, SM rest = left_length
-                        if ( curIndex == 0 and master_list[curIndex+1] in semiminima_left_flag_list ) or \
-                             ( curIndex == len(master_list) - 1 and master_list[curIndex - 1] in semiminima_left_flag_list ) or \
-                             ( master_list[curIndex-1] in semiminima_left_flag_list and master_list[curIndex+1] in semiminima_left_flag_list ):
+            if self.hasLastSB:
+                knownLengthsList[semibrevis_list[-1]] = max(2.0, minRem)
+                minRem -= knownLengthsList[semibrevis_list[-1]]
 
-                            knownLengthsList_changeable[ind] = left_length
-                            minRem_changeable -= left_length
+            elif self.numberOfSemibreves > 0: #semibreves, but no ending SB
+                knownLengthsList[semibrevis_list[-1]] = 2.0
+                minRem -= 2.0
 
-                        # Same as above, but with right flag SMs.
-                        # Then, SM rest = right_length
-                        elif ( (curIndex == 0 and master_list[curIndex+1] in semiminima_right_flag_list) or
-                             (curIndex == len(master_list) - 1 and master_list[curIndex - 1] in semiminima_right_flag_list) or
-                             (master_list[curIndex-1] in semiminima_right_flag_list and master_list[curIndex+1] in semiminima_right_flag_list) ):
+        return knownLengthsList, minRem
 
-                            knownLengthsList_changeable[ind] = right_length
-                            minRem_changeable -= right_length
+    def _translateDivPQMixed(self, left_length, right_length, knownLengthsList, minRem,
+                             semibrevis_downstem_index, restSides, searchState):
+        '''
+        Helper for :meth:`TranslateBrevisLength.translateDivPQ`. Gives left- and
+        right-flagged semiminimae different lengths, assigns semiminima rests
+        according to restSides (see :meth:`TranslateBrevisLength._getSemiminimaRestSides`),
+        and searches for the strongest way to use up the remaining minima.
+
+        searchState holds the extension lists and tuples passed to
+        :meth:`TranslateBrevisLength.determineStrongestMeasureLengths`; it is
+        updated in place. Returns the updated lengths and the minima remaining.
+        '''
+        unknownLengthsDict = self.unknownLengthsDict
+        semibrevis_list = unknownLengthsDict['semibrevis']
+        extend_list = searchState['extend_list']
+        extend_num = searchState['extend_num']
+
+        for ind in unknownLengthsDict['semiminima_left_flag']:
+            knownLengthsList[ind] = left_length
+            minRem -= left_length
+        for ind in unknownLengthsDict['semiminima_right_flag']:
+            knownLengthsList[ind] = right_length
+            minRem -= right_length
+
+        for ind, side in restSides:
+            if side == 'left':
+                knownLengthsList[ind] = left_length
+                minRem -= left_length
+            elif side == 'right':
+                knownLengthsList[ind] = right_length
+                minRem -= right_length
+            #Otherwise, we don't know. Append SM Rest to extend list.
+            else:
+                knownLengthsList[ind] = 0.5
+                extend_list.append(ind)
+            extend_list = _removeRepeatedElements(extend_list) # account for iterations w/o changing order.
 
-                        #Otherwise, we don't know. Append SM Rest to extend list.
-                        else:
-                            knownLengthsList_changeable[ind] = 0.5
-                            extend_list.append(ind)
-                        extend_list = _removeRepeatedElements(extend_list) # account for iterations w/o changing order.
+        if self.numberOfDownstems > 0:
 
-                    if self.numberOfDownstems > 0:
+            if self.numberOfSemibreves > 0:
+                knownLengthsList[semibrevis_list[-1]] = 2.0
+                minRem -= 2.0
 
-                        if self.numberOfSemibreves > 0:
-                            knownLengthsList_changeable[semibrevis_list[-1]] = 2.0
-                            minRem_changeable -= 2.0
+            knownLengthsList[semibrevis_downstem_index] = max(minRem, 2.0)
+            extend_num = min(6*minRem - 15.0, len(extend_list))
+            minRem -= knownLengthsList[semibrevis_downstem_index]
 
-                        knownLengthsList_changeable[semibrevis_downstem_index] = max(minRem_changeable, 2.0)
-                        extend_num = min(6*minRem_changeable - 15.0, len(extend_list))
-                        minRem_changeable -= knownLengthsList_changeable[semibrevis_downstem_index]
+            searchState['shrink_tup'] += semibrevis_downstem_index,
 
-                        shrink_tup += semibrevis_downstem_index,
+        else: #No downstems
+            if self.hasLastSB:
 
-                    else: #No downstems
-                        if self.hasLastSB:
+                knownLengthsList[semibrevis_list[-1]] = max(minRem, 2.0)
+                extend_num = min(6*minRem - 12.0, len(extend_list))
+                minRem -= max(minRem, 2.0)
 
-                            knownLengthsList_changeable[semibrevis_list[-1]] = max(minRem_changeable, 2.0)
-                            extend_num = min(6*minRem_changeable - 12.0, len(extend_list))
-                            minRem_changeable -= max(minRem_changeable, 2.0)
+                searchState['shrink_tup'] += -1,
 
-                            shrink_tup += -1,
+            elif self.numberOfSemibreves > 0: #SBs, but no last SB
+                knownLengthsList[semibrevis_list[-1]] = 2.0
+                minRem -= 2.0
+                extend_num = len(extend_list)
 
-                        elif self.numberOfSemibreves > 0: #SBs, but no last SB
-                            knownLengthsList_changeable[semibrevis_list[-1]] = 2.0
-                            minRem_changeable -= 2.0
-                            extend_num = len(extend_list)
+        searchState['extend_list'] = extend_list
+        searchState['extend_num'] = extend_num
+        searchState['change_tup'] += extend_list,
+        searchState['num_tup'] += extend_num,
+        searchState['diff_tup'] += float(1)/6,
 
-                    change_tup += extend_list,
-                    num_tup += extend_num,
-                    diff_tup += float(1)/6,
+        if minRem > -0.0001:
+            knownLengthsList, minRem = self.determineStrongestMeasureLengths(knownLengthsList,
+                                                                              searchState['change_tup'],
+                                                                              searchState['num_tup'],
+                                                                              searchState['diff_tup'],
+                                                                              minRem,
+                                                                              shrinkable_indices = searchState['shrink_tup'])
+        return knownLengthsList, minRem
+
+    def _getSemiminimaRestSides(self):
+        '''
+        Helper for the semiminima length search in :meth:`TranslateBrevisLength.translateDivPQ`
+        and :meth:`TranslateBrevisLength.translateDivOD`. The result does not depend on
+        the lengths being tried, so it is computed once per search.
+
+        Returns a list of (index, side) pairs, one per semiminima rest. side is
+        'left' if the rest takes the length of the left-flagged semiminimae,
+        'right' if it takes the length of the right-flagged ones, and None if
+        it cannot be determined.
+        '''
+        unknownLengthsDict = self.unknownLengthsDict
+        semiminima_left_flag_list = unknownLengthsDict['semiminima_left_flag']
+        semiminima_right_flag_list = unknownLengthsDict['semiminima_right_flag']
+        semiminima_rest_list = unknownLengthsDict['semiminima_rest']
 
-                    if minRem_changeable > -0.0001:
-                        knownLengthsList_changeable, minRem_changeable = self.determineStrongestMeasureLengths(knownLengthsList_changeable, change_tup, num_tup, diff_tup, minRem_changeable, shrinkable_indices = shrink_tup)
+        master_list = semiminima_left_flag_list + semiminima_right_flag_list + semiminima_rest_list
+        restSides = []
 
-                tempStrength = self.getBreveStrength(knownLengthsList_changeable)
-                self.minimaRemaining = minRem_changeable
+        for ind in semiminima_rest_list:
 
-                if (tempStrength > strength) and (minRem_changeable > -0.0001): #Technically, >= 0, but rounding error occurs.
-                    knownLengthsList = knownLengthsList_changeable[:]
-                    minRem = minRem_changeable
-                    strength = tempStrength
+            curIndex = int(master_list.index(ind))
 
-                knownLengthsList_changeable = knownLengthsList_static
+            # SM Rest is first among all SMs, followed by left flag SM
+            # or, SM Rest is last among all SMs, preceded by left flag SM
+            # or, SM Rest is surrounded by left flag SMs.
+            # Then, SM rest = left_length
+            if ( curIndex == 0 and master_list[curIndex+1] in semiminima_left_flag_list ) or \
+                 ( curIndex == len(master_list) - 1 and master_list[curIndex - 1] in semiminima_left_flag_list ) or \
+                 ( master_list[curIndex-1] in semiminima_left_flag_list and master_list[curIndex+1] in semiminima_left_flag_list ):
+                restSides.append((ind, 'left'))
 
-                if minRem_changeable > -0.0001:
-                    self.minRem_tracker = True
+            # Same as above, but with right flag SMs.
+            # Then, SM rest = right_length
+            elif ( (curIndex == 0 and master_list[curIndex+1] in semiminima_right_flag_list) or
+                 (curIndex == len(master_list) - 1 and master_list[curIndex - 1] in semiminima_right_flag_list) or
+                 (master_list[curIndex-1] in semiminima_right_flag_list and master_list[curIndex+1] in semiminima_right_flag_list) ):
+                restSides.append((ind, 'right'))
 
-                minRem_changeable = minRem_static
+            else:
+                restSides.append((ind, None))
 
-        return knownLengthsList
+        return restSides
 
     def translateDivOD(self, unchangeableNoteLengthsList=None, unknownLengthsDict=None, minRem=None):
         '''
@@ -1708,6 +1892,12 @@ class TranslateBrevisLength(object):
 
             lengths = [(0.5,0.5), (float(2)/3, 0.5), (0.5, float(2)/3), (float(2)/3, float(2)/3)]
             strength = 0
+            maxStrength = self._getBrevisLengthDescriptor()[2]
+            restSides = self._getSemiminimaRestSides()
+
+            lastSemibrevis = None
+            if self.numberOfSemibreves > 0:
+                lastSemibrevis = semibrevis_list[-1]
 
             for (left_length, right_length) in lengths:
 
@@ -1731,24 +1921,13 @@ class TranslateBrevisLength(object):
 
                 else: #left_length != right_length
 
-                    master_list = semiminima_left_flag_list + semiminima_right_flag_list + semiminima_rest_list
-
-                    for ind in semiminima_rest_list:
-                        curIndex = int(master_list.index(ind))
-                        if ( curIndex == 0 and master_list[curIndex+1] in semiminima_left_flag_list ) or \
-                             ( curIndex == len(master_list) - 1 and master_list[curIndex - 1] in semiminima_left_flag_list ) or \
-                             ( master_list[curIndex-1] in semiminima_left_flag_list and master_list[curIndex+1] in semiminima_left_flag_list ):
-
+                    for ind, side in restSides:
+                        if side == 'left':
                             knownLengthsList_changeable[ind] = left_length
                             minRem_changeable -= left_length
-
-                        elif ( (curIndex == 0 and master_list[curIndex+1] in semiminima_right_flag_list) or
-                             (curIndex == len(master_list) - 1 and master_list[curIndex - 1] in semiminima_right_flag_list) or
-                             (master_list[curIndex-1] in semiminima_right_flag_list and master_list[curIndex+1] in semiminima_right_flag_list) ):
-
+                        elif side == 'right':
                             knownLengthsList_changeable[ind] = right_length
                             minRem_changeable -= right_length
-
                         else:
                             knownLengthsList_changeable[ind] = 0.5
                             #extend_list.append(ind)  ### BUG: extend_list does not exist
@@ -1757,8 +1936,8 @@ class TranslateBrevisLength(object):
                 if self.numberOfDownstems > 0:
 
                     if self.numberOfSemibreves > 0:
-                        knownLengthsList_changeable[semibrevis_list[-1]] = 2.0
-                        extend_list_1.append(semibrevis_list[-1])
+                        knownLengthsList_changeable[lastSemibrevis] = 2.0
+                        extend_list_1.append(lastSemibrevis)
                         minRem_changeable -= 2.0
                     extend_list_1 = _removeRepeatedElements(extend_list_1)
 
@@ -1777,8 +1956,7 @@ class TranslateBrevisLength(object):
 
                     else: #downstems > 2
 
-                        from music21 import medren
-                        newMensuralBL = [medren.MensuralNote('A', 'SB') for i in range(len(semibrevis_downstem))]
+                        newMensuralBL = _getSemibrevisPlaceholders(len(semibrevis_downstem))
 
                         newDiv = Divisione('.d.')
                         newDiv.minimaPerBrevis = minRem_changeable
@@ -1795,17 +1973,17 @@ class TranslateBrevisLength(object):
                     if self.numberOfSemibreves > 0:
 
                         if self.hasLastSB:
-                            knownLengthsList_changeable[semibrevis_list[-1]] = max(minRem_changeable, 2.0)
+                            knownLengthsList_changeable[lastSemibrevis] = max(minRem_changeable, 2.0)
                             extend_num_1 = min(len(extend_list_1), int(0.5*minRem_changeable - 1.0))
-                            minRem_changeable -= knownLengthsList_changeable[semibrevis_list[-1]]
+                            minRem_changeable -= knownLengthsList_changeable[lastSemibrevis]
 
                             shrink_tup += -1,
                             if len(extend_list_2) > 0:
                                 shrink_tup += -1,
 
                         else:
-                            knownLengthsList[semibrevis_list[-1]] = 2.0
-                            extend_list_1.append(semibrevis_list[-1])
+                            knownLengthsList[lastSemibrevis] = 2.0
+                            extend_list_1.append(lastSemibrevis)
                             extend_list_1 = _removeRepeatedElements(extend_list_1)
                             extend_num_1 = len(extend_list_1)
                             extend_num_2 = len(extend_list_2)
@@ -1827,13 +2005,40 @@ class TranslateBrevisLength(object):
 
                 knownLengthsList_changeable = knownLengthsList_static
 
-                if minRem_changeable > -0.0001:
-                    self.minRem_tracker = True
+                self.minRem_tracker |= (minRem_changeable > -0.0001)
 
                 minRem_changeable = minRem_static
 
+                if strength >= maxStrength: # no later candidate can be stronger
+                    break
+
         return knownLengthsList
 
+# shape key (see TranslateBrevisLength.getShapeKey): list of lengths in minima
+_knownLengthsCache = {}
+# shapes are few within a piece, but the cache lives as long as the process
+_knownLengthsCacheLimit = 2000
+
+_semibrevisPlaceholders = []
+
+def _getSemibrevisPlaceholders(num):
+    '''
+    Returns a list of num plain semibreves, used as stand-ins when translating
+    a run of downstemmed semibreves. The notes are shared between calls, so they
+    should not be altered.
+
+    >>> sbs = trecento.notation._getSemibrevisPlaceholders(3)
+    >>> sbs
+    [<music21.medren.MensuralNote semibrevis A>, <music21.medren.MensuralNote semibrevis A>, <music21.medren.MensuralNote semibrevis A>]
+    >>> trecento.notation._getSemibrevisPlaceholders(2)[0] is sbs[0]
+    True
+    '''
+    from music21 import medren
+
+    while len(_semibrevisPlaceholders) < num:
+        _semibrevisPlaceholders.append(medren.MensuralNote('A', 'SB'))
+    return _semibrevisPlaceholders[:num]
+
 def _allCombinations(combinationList, num):
     '''
     >>> trecento.notation._allCombinations(['a', 'b'], 2)